@@ -0,0 +1,172 @@
+# action_log.py
+import os
+import struct
+from collections import namedtuple
+
+# One byte per agent decision: the action in the high bits and, for moves
+# and shots, the direction faced (an index into ORIENTATIONS) in the low two.
+MOVE, SHOOT, GRAB, EXIT, WAIT = range(5)
+ACTION_NAMES = ("move", "shoot", "grab", "exit", "wait")
+ACTION_CODES = {name: code for code, name in enumerate(ACTION_NAMES)}
+ORIENTATIONS = "NESW"
+DIRECTION_OF = {(0, 1): 0, (1, 0): 1, (0, -1): 2, (-1, 0): 3}
+STEP_OF = {index: step for step, index in DIRECTION_OF.items()}
+
+# File header: magic, format version and the board settings the seeds are
+# drawn with: size (u32), wumpuses (u32), pits (u32) and pit probability
+# (f64). A hazard count of None (derived from the densities by WumpusWorld)
+# is stored as UNSET, so sizes and counts must be below 2**32 - 1.
+MAGIC = b"WACT"
+VERSION = 2
+HEADER = struct.Struct("<4sHIIId")
+UNSET = 0xFFFFFFFF
+# Per episode: seed (u64), score (i32), win (u8), number of actions (u32),
+# followed by that many action bytes.
+RECORD = struct.Struct("<QiBI")
+
+BoardSettings = namedtuple("BoardSettings", "size num_wumpuses num_pits pit_prob")
+ActionRecord = namedtuple("ActionRecord", "seed score win actions")
+
+def pack_header(settings):
+    """Header bytes for BoardSettings, after checking they fit the format."""
+    size, num_wumpuses, num_pits, pit_prob = settings
+    fields = []
+    for name, value in (("size", size), ("num_wumpuses", num_wumpuses), ("num_pits", num_pits)):
+        if value is None and name != "size":
+            value = UNSET
+        elif not isinstance(value, int) or not 0 <= value < UNSET:
+            raise Exception(f"Cannot store {name}={value!r} in an action log "
+                            f"(an integer from 0 to {UNSET - 1} is needed)")
+        fields.append(value)
+    return HEADER.pack(MAGIC, VERSION, *fields, float(pit_prob))
+
+def encode_action(decision, param, agent):
+    """Pack a decision of WumpusEngine.choose_next_move into one byte."""
+    code = ACTION_CODES[decision]
+    if code == MOVE:
+        return code << 2 | DIRECTION_OF[(param[0] - agent.x, param[1] - agent.y)]
+    if code == SHOOT:
+        return code << 2 | ORIENTATIONS.index(param)
+    return code << 2
+
+def decode_action(byte, agent):
+    """Unpack an action byte into (decision, param) for the agent's position."""
+    code, direction = byte >> 2, byte & 3
+    if code == MOVE:
+        dx, dy = STEP_OF[direction]
+        return "move", (agent.x + dx, agent.y + dy)
+    if code == SHOOT:
+        return "shoot", ORIENTATIONS[direction]
+    return ACTION_NAMES[code], None
+
+# ------------------- ActionLogWriter Class -------------------
+class ActionLogWriter:
+    """
+    Appends the seed, result and action bytes of each episode to an action
+    log. Like EpisodeLogWriter, records are buffered and written every
+    `batch_size` episodes and on flush()/close(). Opening an existing log
+    checks that it was written for the same board settings and drops a
+    record cut short by a crash.
+    """
+    def __init__(self, path, settings, batch_size=256):
+        self.path = path
+        self.settings = BoardSettings(*settings)
+        self.batch_size = batch_size
+        self.buffer = bytearray()
+        self.pending = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        header = pack_header(self.settings)
+        if os.path.exists(path) and 0 < os.path.getsize(path) < HEADER.size:
+            # Cut short while the header was written: no records to keep.
+            os.truncate(path, 0)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            reader = ActionLogReader(path)
+            for _ in reader.records():
+                pass
+            if reader.settings != self.settings:
+                raise Exception(f"{path} was written for {reader.settings}, not {self.settings}")
+            if reader.position < os.path.getsize(path):
+                os.truncate(path, reader.position)
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(header)
+            self.file.flush()
+
+    def append(self, seed, score, win, actions):
+        self.buffer += RECORD.pack(seed, score, bool(win), len(actions))
+        self.buffer += actions
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+            self.pending = 0
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ------------------- ActionLogReader Class -------------------
+class ActionLogReader:
+    """
+    Reads an action log lazily, one episode at a time. `settings` holds the
+    board settings from the header once records() has started. As with
+    EpisodeLogReader, calling records() again resumes where the last call
+    stopped, and a record cut short at the end of the file is left for the
+    next call.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.settings = None
+        self.position = 0
+
+    def check_header(self, f):
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return False
+        magic, version, size, num_wumpuses, num_pits, pit_prob = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise Exception(f"{self.path} is not a version {VERSION} action log")
+        self.settings = BoardSettings(size,
+                                      None if num_wumpuses == UNSET else num_wumpuses,
+                                      None if num_pits == UNSET else num_pits,
+                                      pit_prob)
+        self.position = HEADER.size
+        return True
+
+    def records(self):
+        """Yield the episodes not read yet as ActionRecord tuples."""
+        with open(self.path, "rb") as f:
+            if self.position == 0 and not self.check_header(f):
+                return
+            f.seek(self.position)
+            while True:
+                head = f.read(RECORD.size)
+                if len(head) < RECORD.size:
+                    return
+                seed, score, win, length = RECORD.unpack(head)
+                actions = f.read(length)
+                if len(actions) < length:
+                    return
+                self.position += RECORD.size + length
+                yield ActionRecord(seed, score, win, actions)
+
+def read_action_log(path):
+    """Return the board settings of an action log and an iterator over its records."""
+    reader = ActionLogReader(path)
+    with open(path, "rb") as f:
+        reader.check_header(f)
+    return reader.settings, reader.records()
@@ -0,0 +1,154 @@
+# batch.py
+import argparse
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from engine import WumpusEngine
+from episode_log import EpisodeLogWriter, new_log_path
+from action_log import ActionLogWriter
+
+# Engine reused by every chunk a worker process runs.
+_worker_engine = None
+
+# Base seeds and episode indices each take 32 bits of an episode's seed, so
+# every seed fits the u64 seed field of the episode and action logs and no
+# two (base seed, index) pairs share one.
+SEED_LIMIT = 1 << 32
+
+def episode_seed(base_seed, index):
+    """
+    Seed for episode `index` of a run. It depends only on the run's base
+    seed and the episode index, so results do not change with the number
+    of workers or the way episodes are split into chunks. Both must be in
+    range(SEED_LIMIT).
+    """
+    return (base_seed << 32) + index
+
+def check_base_seed(base_seed):
+    """Return `base_seed` if it can seed a run, otherwise raise."""
+    if not 0 <= base_seed < SEED_LIMIT:
+        raise Exception(f"Base seed {base_seed} is out of range (0 to {SEED_LIMIT - 1})")
+    return base_seed
+
+def _seed_arg(text):
+    try:
+        return check_base_seed(int(text))
+    except Exception as exc:
+        raise argparse.ArgumentTypeError(str(exc))
+
+def _get_engine(size, pit_prob):
+    global _worker_engine
+    if (_worker_engine is None or _worker_engine.size != size or
+            _worker_engine.pit_prob != pit_prob):
+        _worker_engine = WumpusEngine(size, pit_prob)
+    return _worker_engine
+
+def _run_chunk(args):
+    # Run episodes [start, stop) and return one row per episode, ending
+    # with the episode's action bytes if they are asked for.
+    size, pit_prob, base_seed, start, stop, keep_actions = args
+    engine = _get_engine(size, pit_prob)
+    rows = []
+    for index in range(start, stop):
+        seed = episode_seed(base_seed, index)
+        engine.new_game(seed=seed)
+        result = engine.run_episode()
+        rows.append((index, seed, result["score"], result["win"], result["time"],
+                     result["steps"], result["arrows_used"],
+                     bytes(engine.actions) if keep_actions else None))
+    return rows
+
+def _log_rows(writer, action_writer, rows, totals):
+    # Append a chunk's rows to the episode log (and the action log, if any)
+    # and add them to the running totals; the rows themselves are dropped.
+    for index, seed, score, win, elapsed, steps, arrows_used, actions in rows:
+        writer.append(seed, score, win, steps, arrows_used, elapsed)
+        if action_writer is not None:
+            action_writer.append(seed, score, win, actions)
+        totals["iterations"] += 1
+        totals["wins"] += bool(win)
+        totals["score"] += score
+
+def results_summary(iterations, wins, score_total, log):
+    """
+    The iteration_results.pkl layout, shared by batch runs and the GUI: the
+    run's totals plus the path of the episode log holding every episode.
+    """
+    return {
+        "iterations": iterations,
+        "win_rate": wins / iterations * 100 if iterations else 0.0,
+        "avg_score": score_total / iterations if iterations else 0.0,
+        "log": log,
+    }
+
+def run_batch(episodes, workers=None, size=20, pit_prob=0.2, base_seed=0, chunksize=None,
+              log=None, actions=None):
+    """
+    Play `episodes` headless games spread over a process pool.
+
+    Every episode is appended, in episode order, to the episode log at
+    `log` (a new one in Results/Logs if None) as its chunk comes back, so
+    memory does not grow with the number of episodes. If `actions` is a
+    path, the episodes' actions are appended to that action log too (see
+    replay.py). Returns results_summary() for the run.
+    """
+    check_base_seed(base_seed)
+    if episodes > SEED_LIMIT:
+        raise Exception(f"A run has at most {SEED_LIMIT} episodes, not {episodes}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunksize is None:
+        # A few chunks per worker keeps the pool busy without much IPC.
+        chunksize = max(1, min(1000, episodes // (workers * 4) or 1))
+    chunks = [(size, pit_prob, base_seed, start, min(start + chunksize, episodes),
+               actions is not None)
+              for start in range(0, episodes, chunksize)]
+
+    if log is None:
+        log = new_log_path("batch")
+    totals = {"iterations": 0, "wins": 0, "score": 0}
+    writer = EpisodeLogWriter(log)
+    action_writer = None
+    try:
+        if actions:
+            action_writer = ActionLogWriter(actions, _get_engine(size, pit_prob).board_settings())
+        if workers == 1:
+            for chunk in chunks:
+                _log_rows(writer, action_writer, _run_chunk(chunk), totals)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for chunk_rows in pool.map(_run_chunk, chunks):
+                    _log_rows(writer, action_writer, chunk_rows, totals)
+    finally:
+        writer.close()
+        if action_writer is not None:
+            action_writer.close()
+    return results_summary(totals["iterations"], totals["wins"], totals["score"], log)
+
+# ------------------- Main Entry Point -------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run Wumpus World episodes on a process pool.")
+    parser.add_argument("episodes", type=int)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--seed", type=_seed_arg, default=0,
+                        help=f"base seed of the run, from 0 to {SEED_LIMIT - 1} (default: %(default)s)")
+    parser.add_argument("--output", default="iteration_results.pkl")
+    parser.add_argument("--log", default=None,
+                        help="episode log to append every episode to (default: a new one in Results/Logs)")
+    parser.add_argument("--actions", default=None,
+                        help="also append every episode's actions to this action log, for replay.py")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_batch(args.episodes, workers=args.workers, size=args.size,
+                        base_seed=args.seed, log=args.log, actions=args.actions)
+    elapsed = time.perf_counter() - start
+    with open(args.output, "wb") as f:
+        pickle.dump(results, f)
+    print(f"Iterations: {results['iterations']}")
+    print(f"Average Score: {results['avg_score']:.2f}")
+    print(f"Win Rate: {results['win_rate']:.2f}%")
+    print(f"Episode Log: {results['log']}")
+    print(f"Total Time: {elapsed:.2f}s")
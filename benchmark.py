@@ -0,0 +1,183 @@
+# benchmark.py
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from logic import WumpusWorld
+from engine import WumpusEngine
+
+DEFAULT_SIZES = [20, 50, 100, 200, 500]
+BASELINE_PATH = os.path.join("Results", "Benchmarks", "baseline.json")
+# Slowdown (as a fraction of the baseline) reported as a regression.
+THRESHOLD = 0.25
+
+def hazard_counts(size):
+    # Wumpuses and pits at the density of the default 20x20 board (15 and 20).
+    cells = size * size
+    return cells * 15 // 400, cells * 20 // 400
+
+def per_call(func, number, repeat=5):
+    """Best average time of `number` calls to func over `repeat` runs, in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+# ------------------- TimedEngine Class -------------------
+class TimedEngine(WumpusEngine):
+    """WumpusEngine that adds up the time spent in each decision phase."""
+    def __init__(self, *args, **kwargs):
+        self.phase_time = {"update_knowledge": 0.0, "choose_next_move": 0.0}
+        self.phase_calls = {"update_knowledge": 0, "choose_next_move": 0}
+        WumpusEngine.__init__(self, *args, **kwargs)
+
+    def update_knowledge(self):
+        start = time.perf_counter()
+        WumpusEngine.update_knowledge(self)
+        self.phase_time["update_knowledge"] += time.perf_counter() - start
+        self.phase_calls["update_knowledge"] += 1
+
+    def choose_next_move(self):
+        start = time.perf_counter()
+        decision = WumpusEngine.choose_next_move(self)
+        self.phase_time["choose_next_move"] += time.perf_counter() - start
+        self.phase_calls["choose_next_move"] += 1
+        return decision
+
+def bench_size(size, episodes, max_steps, seed=0):
+    """
+    Run every benchmark case on size x size boards. Returns a dict of
+    case name -> seconds (per call, per step or per episode); lower is
+    better for all of them.
+    """
+    num_wumpuses, num_pits = hazard_counts(size)
+    results = {}
+
+    random.seed(seed)
+    results["world_construction"] = per_call(
+        lambda: WumpusWorld(size, num_wumpuses=num_wumpuses, num_pits=num_pits),
+        max(1, 2000 // size), repeat=3)
+
+    world = WumpusWorld(size, num_wumpuses=num_wumpuses, num_pits=num_pits)
+    cells = [(random.randrange(size), random.randrange(size)) for _ in range(1000)]
+    results["get_percepts"] = per_call(
+        lambda: [world.get_percepts(x, y) for x, y in cells], 20) / len(cells)
+
+    engine = TimedEngine(size, num_wumpuses=num_wumpuses, num_pits=num_pits)
+    steps = 0
+    elapsed = 0.0
+    for i in range(episodes):
+        engine.new_game(seed=seed + i)
+        result = engine.run_episode(max_steps=max_steps)
+        steps += result["steps"]
+        elapsed += result["time"]
+    for phase, total in engine.phase_time.items():
+        results[phase] = total / max(1, engine.phase_calls[phase])
+    results["episode"] = elapsed / episodes
+    results["episode_step"] = elapsed / max(1, steps)
+
+    # Path queries over the knowledge left by the last episode, from the
+    # start to the visited cells farthest away from it.
+    start = (0, 0)
+    reach = max(x + y for x, y in engine.visited)
+    far = [c for c in engine.visited if c[0] + c[1] >= reach - 2]
+    goal = max(engine.visited, key=lambda c: (c[0] + c[1], c))
+    results["find_path_knowledge"] = per_call(
+        lambda: engine.find_path_knowledge(start, [goal]), 20)
+    results["find_path_to_any"] = per_call(
+        lambda: engine.find_path_to_any(start, far), 20)
+    results["find_path_ground_truth"] = per_call(
+        lambda: engine.find_path_ground_truth(start, goal), 20)
+    return results
+
+def run_suite(sizes, episodes=None, seed=0):
+    """Benchmark every size; returns the machine-readable report."""
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+        },
+        "results": {},
+    }
+    for size in sizes:
+        count = episodes if episodes is not None else max(2, 1000 // size)
+        report["results"][str(size)] = bench_size(size, count, max_steps=50 * size, seed=seed)
+        report["meta"].setdefault("episodes", {})[str(size)] = count
+    return report
+
+def compare(baseline, current, threshold=THRESHOLD):
+    """
+    Compare two reports case by case. Returns rows of
+    (size, case, baseline seconds, current seconds, relative change,
+    regressed) for the cases present in both.
+    """
+    rows = []
+    for size, cases in current["results"].items():
+        base_cases = baseline["results"].get(size, {})
+        for case, value in cases.items():
+            base = base_cases.get(case)
+            if not base:
+                continue
+            change = value / base - 1.0
+            rows.append((size, case, base, value, change, change > threshold))
+    return rows
+
+def format_seconds(value):
+    if value >= 1:
+        return f"{value:.2f}s"
+    if value >= 1e-3:
+        return f"{value * 1e3:.2f}ms"
+    return f"{value * 1e6:.1f}us"
+
+def print_report(report):
+    for size, cases in report["results"].items():
+        print(f"size {size}")
+        for case, value in cases.items():
+            print(f"  {case:<24}{format_seconds(value):>12}")
+
+# ------------------- Main Entry Point -------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the world, the agent and full episodes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--episodes", type=int, default=None,
+                        help="episodes per size (default: more for small boards)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", nargs="?", const=BASELINE_PATH, default=None,
+                        help="write the report as the baseline (default path: %(const)s)")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, default=None,
+                        help="compare against a stored baseline (default path: %(const)s)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="slowdown flagged as a regression (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    report = run_suite(args.sizes, args.episodes, args.seed)
+    print_report(report)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(baseline, report, args.threshold)
+        print(f"\nAgainst {args.compare} (threshold {args.threshold:.0%}):")
+        for size, case, base, value, change, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"  {size:>4} {case:<24}{format_seconds(base):>12}{format_seconds(value):>12}"
+                  f"{change:>+9.1%}{flag}")
+        regressions = sum(1 for row in rows if row[5])
+        print(f"{regressions} regression(s)")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,535 @@
+# engine.py
+import argparse
+import time
+from logic import WumpusGame
+from knowledge import BACKENDS
+from search import GridSearch, PlanCache
+from probability import FrontierInference
+from action_log import encode_action
+
+# Largest chance of death the agent accepts when it has to guess.
+RISK_LIMIT = 0.5
+
+# ------------------- WumpusEngine Class -------------------
+class WumpusEngine:
+    """
+    Headless version of the auto agent.
+
+    Holds the agent's knowledge, inference rules, decision logic and scoring
+    without importing tkinter, so whole episodes can run as a tight loop.
+    `knowledge` picks the inference backend from knowledge.BACKENDS.
+    When no safe move is left, the agent enters the frontier cell least
+    likely to be fatal if that risk is at most `risk_limit` (None always
+    waits instead).
+    The GUI subclasses this class and overrides the display hooks
+    (display_message, refresh, on_game_over) to render each step.
+    """
+    # Path search kernel, built once per engine for its board size.
+    search_class = GridSearch
+
+    def __init__(self, size=20, pit_prob=0.2, num_wumpuses=15, num_pits=20, knowledge="rules",
+                 risk_limit=RISK_LIMIT):
+        self.size = size
+        self.knowledge_backend = BACKENDS[knowledge]
+        self.search = self.search_class(size)
+        self.plan = PlanCache(size)
+        self.inference = FrontierInference(size)
+        self.risk_limit = risk_limit
+        # PhaseProfiler attached to this engine, if any (see profiler.py).
+        self.profiler = None
+        self.pit_prob = pit_prob
+        self.num_wumpuses = num_wumpuses
+        self.num_pits = num_pits
+        self.new_game()
+
+    def new_game(self, world=None, seed=None):
+        """
+        Start a fresh board and reset the agent's knowledge and score.
+        A ready-made WumpusWorld (e.g. from generate_boards) can be passed in;
+        otherwise the board is drawn from `seed` (a random one if None, kept
+        in self.game.seed).
+        """
+        self.game = WumpusGame(self.size, self.pit_prob, self.num_wumpuses, self.num_pits,
+                               world=world, seed=seed)
+        self.score = 0
+        self.steps = 0
+        self.arrows_at_start = self.game.agent.arrows
+        # One byte per decision (see action_log.py), for replaying the episode.
+        self.actions = bytearray()
+
+        # Tracking visited, safe cells, stench cells, etc.
+        self.visited = {(self.game.agent.x, self.game.agent.y)}
+        self.visited_percepts = {}
+        self.stench_cells = set()
+        # Number of stench cells next to each cell (for picking a target).
+        self.stench_adjacent = {}
+
+        # Knowledge base; safe_set is the backend's live set of safe cells.
+        self.knowledge = self.knowledge_backend(self.size)
+        self.safe_set = self.knowledge.safe_set
+
+        # Cached route and how much of safe_log it has already seen.
+        self.plan.clear()
+        self.plan_safe_seen = len(self.knowledge.safe_log)
+
+        # Safe cells indexed by row (y -> xs) and column (x -> ys), filled
+        # from safe_log, for finding vantage spots.
+        self.safe_in_row = {}
+        self.safe_in_col = {}
+        self.safe_indexed = 0
+        # Safe cells not visited yet (flat indices), filled from safe_log.
+        self.unexplored = set()
+        self.unexplored_seen = 0
+
+        # Frontier model for guessing when no safe move is left.
+        self.inference.reset()
+        self.inference.visit((self.game.agent.x, self.game.agent.y))
+
+    # ------------------- Display Hooks -------------------
+    def display_message(self, text, color="black"):
+        # Headless: nothing to show.
+        pass
+
+    def refresh(self):
+        # Headless: nothing to redraw.
+        pass
+
+    def on_game_over(self, victory=False):
+        # Headless: the episode loop notices game_over by itself.
+        pass
+
+    def cell_changed(self, cell):
+        # Headless: called when a cell's recorded percepts change.
+        pass
+
+    # ------------------- Episode Loop -------------------
+    def step(self):
+        """
+        Advance the agent by one decision and return the decision taken.
+        A "wait" decision ends the game as a loss.
+        """
+        self.update_knowledge()
+        decision, param = self.choose_next_move()
+        self.actions.append(encode_action(decision, param, self.game.agent))
+        if decision == "wait":
+            self.display_message("No safe moves - waiting... Loss.", "orange")
+            self.game.game_over = True
+            return decision
+        self.execute_action(decision, param)
+        self.steps += 1
+
+        ax, ay = self.game.agent.x, self.game.agent.y
+        self.visited.add((ax, ay))
+        self.record_percepts(ax, ay)
+        if decision == "shoot" and not self.game.world.count_wumpuses():
+            # Re-record stench for all visited cells if all wumpuses are dead
+            for cell in self.visited:
+                self.record_percepts(cell[0], cell[1])
+        return decision
+
+    def run_episode(self, max_steps=None):
+        """
+        Run the current game to the end without rendering.
+
+        Returns a dict with the final score, the win flag, the number of
+        actions taken, the arrows used and the wall time in seconds. If
+        max_steps is given, the episode is cut off (and scored as a loss)
+        after that many actions.
+        """
+        start = time.perf_counter()
+        while not self.game.game_over:
+            if max_steps is not None and self.steps >= max_steps:
+                self.game.game_over = True
+                break
+            self.step()
+        elapsed = time.perf_counter() - start
+        if self.profiler is not None:
+            self.profiler.end_episode(self, elapsed)
+        return {
+            "score": self.score,
+            "win": self.is_win(),
+            "steps": self.steps,
+            "arrows_used": self.arrows_used(),
+            "time": elapsed,
+        }
+
+    def arrows_used(self):
+        return self.arrows_at_start - self.game.agent.arrows
+
+    def board_settings(self):
+        # What a seed needs besides itself to rebuild a board (see action_log.py).
+        return (self.size, self.num_wumpuses, self.num_pits, self.pit_prob)
+
+    def is_win(self):
+        return self.game.agent.has_gold and self.game.world.count_wumpuses() == 0
+
+    # ------------------- Knowledge / Inference Logic -------------------
+    def record_percepts(self, x, y):
+        per = self.game.world.get_percepts(x, y)
+        self.visited_percepts[(x, y)] = per
+        self.unexplored.discard(x * self.size + y)
+        self.cell_changed((x, y))
+        if "stench" in per and (x, y) not in self.stench_cells:
+            self.stench_cells.add((x, y))
+            for n in self.get_neighbors((x, y)):
+                self.stench_adjacent[n] = self.stench_adjacent.get(n, 0) + 1
+        self.knowledge.observe((x, y), per)
+        self.inference.visit((x, y))
+
+    def update_knowledge(self):
+        set_limit = getattr(self.knowledge, "set_limit", None)
+        if set_limit is not None:
+            # Backends that can use the hazard counts left on the board.
+            world = self.game.world
+            set_limit('pit', world.count_pits())
+            set_limit('wumpus', world.count_wumpuses())
+        self.knowledge.update()
+
+    def get_neighbors(self, pos):
+        x, y = pos
+        nbrs = []
+        for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
+            nx, ny = x+dx, y+dy
+            if 0 <= nx < self.size and 0 <= ny < self.size:
+                nbrs.append((nx, ny))
+        return nbrs
+
+    def index_safe_cells(self):
+        # Add the cells that became safe since the last call to the row/column index.
+        safe_log = self.knowledge.safe_log
+        for idx in safe_log[self.safe_indexed:]:
+            x, y = divmod(idx, self.size)
+            self.safe_in_row.setdefault(y, []).append(x)
+            self.safe_in_col.setdefault(x, []).append(y)
+        self.safe_indexed = len(safe_log)
+
+    def unexplored_cells(self):
+        # Known-safe cells the agent has not visited yet.
+        safe_log = self.knowledge.safe_log
+        for idx in safe_log[self.unexplored_seen:]:
+            if divmod(idx, self.size) not in self.visited:
+                self.unexplored.add(idx)
+        self.unexplored_seen = len(safe_log)
+        return [divmod(idx, self.size) for idx in self.unexplored]
+
+    def safe_vantage_spots(self, wx, wy):
+        # Known-safe cells in the same row or column as (wx, wy).
+        self.index_safe_cells()
+        vantage = {(vx, wy) for vx in self.safe_in_row.get(wy, ())}
+        vantage.update((wx, vy) for vy in self.safe_in_col.get(wx, ()))
+        return vantage
+
+    def find_path_to_any(self, start, candidates):
+        return self.find_path(start, candidates, self.knowledge.safe_map)
+
+    def find_path_knowledge(self, start, goals):
+        return self.find_path(start, goals, self.knowledge.safe_map)
+
+    def find_path_ground_truth(self, start, goal):
+        return self.find_path(start, [goal], self.game.world.free_map())
+
+    def find_path(self, start, goals, passable):
+        """
+        BFS from start to the nearest cell in goals through cells with
+        passable[x * size + y] set. Returns the full path, or None.
+        """
+        goal = self.search.bfs((start[0] * self.size + start[1],),
+                               {x * self.size + y for x, y in goals}, passable)
+        if goal < 0:
+            return None
+        return [divmod(idx, self.size) for idx in self.search.path(goal)]
+
+    def next_step(self, start, goals, passable):
+        """
+        Like find_path, but only return the first move along the path.
+        Returns None when no goal is reachable or start is already a goal.
+        """
+        src = start[0] * self.size + start[1]
+        goal = self.search.bfs((src,), {x * self.size + y for x, y in goals}, passable)
+        if goal < 0 or goal == src:
+            return None
+        return divmod(self.search.first_step(goal), self.size)
+
+    def planned_step(self, key, start, goals):
+        """
+        First move towards the nearest cell in goals (a collection, or a
+        function returning one) through known-safe cells. The cached route
+        for `key` is reused while it is still valid; goals is only built
+        when a new search is needed. Returns None if no goal is reachable.
+        """
+        src = start[0] * self.size + start[1]
+        safe_log = self.knowledge.safe_log
+        step = self.plan.next_step(key, src, safe_log[self.plan_safe_seen:])
+        self.plan_safe_seen = len(safe_log)
+        if step >= 0:
+            return divmod(step, self.size)
+        if callable(goals):
+            goals = goals()
+        goal = self.search.bfs((src,), {x * self.size + y for x, y in goals},
+                               self.knowledge.safe_map)
+        if goal < 0 or goal == src:
+            return None
+        return divmod(self.plan.store(key, self.search.path(goal)), self.size)
+
+    # ------------------- Decision Logic for Auto Mode -------------------
+    def choose_next_move(self):
+        agent = self.game.agent
+        current = (agent.x, agent.y)
+
+        # If agent has gold and no wumpuses => go home
+        if self.is_win():
+            if current == (0, 0):
+                return ("exit", None)
+            step = self.next_step(current, [(0, 0)], self.game.world.free_map())
+            if step:
+                return ("move", step)
+            else:
+                return ("wait", None)
+
+        # If current cell has gold => grab
+        if "glitter" in self.game.world.get_percepts(*current):
+            return ("grab", None)
+
+        # Attempt to shoot a known wumpus if possible
+        known_wumpus = self.knowledge.known_wumpuses() if agent.arrows > 0 else ()
+        if known_wumpus:
+            candidate = None
+            max_cnt = 0
+            for c in known_wumpus:
+                # Count how many stench cells are next to c
+                cnt = self.stench_adjacent.get(c, 0)
+                if cnt > max_cnt:
+                    max_cnt = cnt
+                    candidate = c
+            if candidate:
+                (wx, wy) = candidate
+                # If aligned => shoot
+                if wx == agent.x or wy == agent.y:
+                    if wx == agent.x:
+                        return ("shoot", 'N' if wy > agent.y else 'S')
+                    else:
+                        return ("shoot", 'E' if wx > agent.x else 'W')
+                else:
+                    # Move to vantage spot
+                    step = self.planned_step(
+                        ("vantage", candidate), current,
+                        lambda: self.safe_vantage_spots(wx, wy))
+                    if step:
+                        return ("move", step)
+                    return self.risky_move(current)
+
+        # Otherwise, move to a safe, unvisited neighbor
+        neighbors = self.get_neighbors(current)
+        safe_nbr = [n for n in neighbors if n in self.safe_set and n not in self.visited]
+        if safe_nbr:
+            return ("move", safe_nbr[0])
+
+        # BFS to any unvisited safe cell
+        step = self.planned_step("explore", current, self.unexplored_cells)
+        if step:
+            return ("move", step)
+
+        # No safe moves => take the least risky one, or wait => treat as loss
+        return self.risky_move(current)
+
+    def hazard_priors(self):
+        # Density of each hazard among the cells not known to be safe.
+        world = self.game.world
+        unknown = max(1, self.size * self.size - len(self.safe_set))
+        return {'pit': world.count_pits() / unknown,
+                'wumpus': world.count_wumpuses() / unknown}
+
+    def risky_move(self, current):
+        """
+        Head for the frontier cell least likely to hold a pit or a live
+        wumpus, walking through known-safe cells. Returns ("wait", None)
+        when guessing is disabled, nothing is reachable or the smallest
+        risk is above risk_limit.
+        """
+        if self.risk_limit is None:
+            return ("wait", None)
+        risks = self.inference.risks(self.knowledge, self.visited_percepts,
+                                     self.hazard_priors())
+        if not risks:
+            return ("wait", None)
+        best = min(risks.values())
+        if best > self.risk_limit:
+            return ("wait", None)
+        targets = [c for c, r in risks.items() if r <= best + 1e-9]
+        safe_map = self.knowledge.safe_map
+        passable = type(safe_map)(safe_map)
+        for x, y in targets:
+            passable[x * self.size + y] = 1
+        step = self.next_step(current, targets, passable)
+        if step is None:
+            return ("wait", None)
+        self.display_message(f"No safe moves - taking a {best:.0%} risk.", "orange")
+        return ("move", step)
+
+    def execute_action(self, action, param):
+        if action == "move":
+            self.turn_to_cell(param)
+            self.move_auto()
+        elif action == "grab":
+            self.grab()
+        elif action == "shoot":
+            if self.game.agent.arrows > 0:
+                self.game.agent.orientation = param
+                self.refresh()
+                self.shoot()
+        elif action == "exit":
+            self.exit_game()
+        elif action == "wait":
+            self.display_message("No safe moves - waiting... Loss.", "orange")
+            self.game.game_over = True
+            self.on_game_over()
+
+    def turn_to_cell(self, cell):
+        """For auto-run: turn to face the next cell if needed."""
+        ax, ay = self.game.agent.x, self.game.agent.y
+        cx, cy = cell
+        desired = None
+        if cx > ax:
+            desired = 'E'
+        elif cx < ax:
+            desired = 'W'
+        elif cy > ay:
+            desired = 'N'
+        elif cy < ay:
+            desired = 'S'
+        if desired and self.game.agent.orientation != desired:
+            self.game.agent.orientation = desired
+            self.refresh()
+
+    def move_auto(self):
+        """Auto-run movement logic."""
+        if self.game.game_over:
+            return
+        bump = self.game.agent.move_forward(self.game.world)
+        self.score -= 1
+        if bump:
+            self.display_message("Bumped into a wall!", "orange")
+        else:
+            if self.check_for_hazard():
+                self.refresh()
+                return
+            self.display_message("Moved safely.", "black")
+        self.refresh()
+        self.check_win_condition()
+
+    # ------------------- Basic Game Actions -------------------
+    def check_for_hazard(self):
+        world = self.game.world
+        pos = (self.game.agent.x, self.game.agent.y)
+        if world.pits[pos]:
+            self.game.agent.alive = False
+            self.game.game_over = True
+            self.score -= 1000
+            self.display_message("You fell into a pit! Game Over.", "red")
+            self.on_game_over()
+            return True
+        if world.wumpuses[pos]:
+            self.game.agent.alive = False
+            self.game.game_over = True
+            self.score -= 1000
+            self.display_message("You encountered a live Wumpus! Game Over.", "red")
+            self.on_game_over()
+            return True
+        return False
+
+    def check_win_condition(self):
+        if self.is_win() and not self.game.game_over:
+            self.game.game_over = True
+            self.on_game_over(victory=True)
+
+    def shoot(self):
+        if self.game.game_over:
+            return
+        if self.game.agent.arrows <= 0:
+            self.display_message("No arrows left!", "orange")
+            return
+        self.score -= 10
+        self.game.agent.arrows -= 1
+        x, y = self.game.agent.x, self.game.agent.y
+        orientation = self.game.agent.orientation
+        killed, posk = self.game.world.shoot_arrow(x, y, orientation)
+        if killed:
+            self.display_message("You killed a Wumpus!", "green")
+            self.score += 100
+            if posk:
+                self.knowledge.kill(posk)
+                # Re-read the neighbours' stench; another wumpus may still be next to them
+                for nb in self.get_neighbors(posk):
+                    per = self.visited_percepts.get(nb)
+                    if per and "stench" in per:
+                        fresh = self.game.world.get_percepts(*nb)
+                        if fresh != per:
+                            self.visited_percepts[nb] = fresh
+                            self.knowledge.observe(nb, fresh)
+                            self.cell_changed(nb)
+        else:
+            self.display_message("You missed! Game Over.", "red")
+            self.score -= 1000
+            self.game.game_over = True
+            self.refresh()
+            self.on_game_over()
+            return
+        self.refresh()
+        self.check_win_condition()
+
+    def grab(self):
+        if self.game.game_over:
+            return
+        if self.game.world.take_gold(self.game.agent.x, self.game.agent.y):
+            self.game.agent.has_gold = True
+            self.display_message("You picked up the gold!", "green")
+            self.score += 500
+        else:
+            self.display_message("No gold here!", "orange")
+        self.refresh()
+        self.check_win_condition()
+
+    def exit_game(self):
+        if self.game.game_over:
+            return
+        if self.is_win():
+            self.score += 1000
+            self.display_message("You exited with gold & all Wumpuses dead! Victory!", "green")
+        else:
+            self.display_message("Exited early. (Goal not fully met)", "black")
+        self.game.game_over = True
+        self.on_game_over()
+
+# ------------------- Main Entry Point -------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run headless Wumpus World episodes.")
+    parser.add_argument("episodes", type=int, nargs="?", default=100)
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--knowledge", choices=sorted(BACKENDS), default="rules")
+    parser.add_argument("--risk-limit", type=float, default=RISK_LIMIT,
+                        help="largest chance of death accepted when guessing (0 never guesses)")
+    parser.add_argument("--profile", metavar="PATH", default=None,
+                        help="time each phase of the agent's loop and write the results as JSON")
+    args = parser.parse_args()
+
+    engine = WumpusEngine(size=args.size, knowledge=args.knowledge, risk_limit=args.risk_limit)
+    if args.profile:
+        from profiler import PhaseProfiler
+        PhaseProfiler().attach(engine)
+    wins = 0
+    total_score = 0
+    start = time.perf_counter()
+    for i in range(args.episodes):
+        if i:
+            engine.new_game()
+        result = engine.run_episode()
+        wins += result["win"]
+        total_score += result["score"]
+    elapsed = time.perf_counter() - start
+    print(f"Episodes: {args.episodes}")
+    print(f"Average Score: {total_score / args.episodes:.2f}")
+    print(f"Win Rate: {wins / args.episodes * 100:.2f}%")
+    print(f"Total Time: {elapsed:.2f}s")
+    if engine.profiler is not None:
+        engine.profiler.save(args.profile)
+        print(engine.profiler.summary())
@@ -0,0 +1,126 @@
+# episode_log.py
+import os
+import struct
+import time
+from collections import namedtuple
+
+# File header: magic, format version and record size.
+MAGIC = b"WLOG"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+
+# One fixed-width record per episode, little-endian:
+# seed (u64), score (i32), win (u8), steps (u32), arrows used (u16), time in seconds (f64).
+RECORD = struct.Struct("<QiBIHd")
+
+Episode = namedtuple("Episode", "seed score win steps arrows_used time")
+
+LOG_DIR = os.path.join("Results", "Logs")
+
+def new_log_path(prefix):
+    # Timestamped log path for a new run, e.g. Results/Logs/batch-20250101-120000.wlog.
+    return os.path.join(LOG_DIR, time.strftime(f"{prefix}-%Y%m%d-%H%M%S.wlog"))
+
+# ------------------- EpisodeLogWriter Class -------------------
+class EpisodeLogWriter:
+    """
+    Appends episode records to a log file. Records are packed into a
+    buffer and written (and flushed) every `batch_size` episodes and on
+    flush()/close(), so a crash loses at most the last batch. Opening an
+    existing log appends to it, after dropping a record cut short by a
+    crash; a log whose header was cut short holds no records and is
+    started again.
+    """
+    def __init__(self, path, batch_size=256):
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer = bytearray()
+        self.pending = 0
+        self.count = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path):
+            size = os.path.getsize(path)
+            if size < HEADER.size:
+                os.truncate(path, 0)
+            else:
+                with open(path, "rb") as f:
+                    EpisodeLogReader(path).check_header(f)
+                torn = (size - HEADER.size) % RECORD.size
+                if torn:
+                    os.truncate(path, size - torn)
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            self.file.flush()
+
+    def append(self, seed, score, win, steps, arrows_used, time):
+        self.buffer += RECORD.pack(seed, score, bool(win), steps, arrows_used, time)
+        self.pending += 1
+        self.count += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+            self.pending = 0
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ------------------- EpisodeLogReader Class -------------------
+class EpisodeLogReader:
+    """
+    Reads an episode log lazily, a block of records at a time. The reader
+    remembers how far it got, so calling episodes() again on a log that is
+    still being written yields only the records added since. A record cut
+    short at the end of the file (a write in progress, or a crash) is left
+    for the next call.
+    """
+    def __init__(self, path, block_records=4096):
+        self.path = path
+        self.block_size = block_records * RECORD.size
+        self.position = 0
+
+    def check_header(self, f):
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return False
+        magic, version, size = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or size != RECORD.size:
+            raise Exception(f"{self.path} is not a version {VERSION} episode log")
+        self.position = HEADER.size
+        return True
+
+    def episodes(self):
+        """Yield the records not read yet as Episode tuples."""
+        with open(self.path, "rb") as f:
+            if self.position == 0 and not self.check_header(f):
+                return
+            f.seek(self.position)
+            while True:
+                block = f.read(self.block_size)
+                usable = len(block) - len(block) % RECORD.size
+                if not usable:
+                    return
+                self.position += usable
+                for fields in RECORD.iter_unpack(block[:usable]):
+                    yield Episode(*fields)
+                if usable < len(block):
+                    return
+
+def read_episodes(path):
+    """Iterate over every record of an episode log."""
+    return EpisodeLogReader(path).episodes()
@@ -1,53 +1,49 @@
 # gui.py
 import tkinter as tk
 from tkinter import messagebox
-from collections import deque
-from logic import WumpusGame
-import pickle
-import matplotlib.pyplot as plt
+from bisect import bisect_left
+from engine import WumpusEngine
+from reports import ReportWorker
+from profiler import PhaseProfiler
+from episode_log import EpisodeLogWriter, new_log_path
+from batch import episode_seed, results_summary
+import random
 import time
 
-class WumpusGameGUI_Auto:
+class WumpusGameGUI_Auto(WumpusEngine):
     def __init__(self, master, size=20, pit_prob=0.2):
         self.master = master
         self.master.title("Wumpus World - Enhanced Agent")
         self.master.geometry("1920x1800")
         self.master.configure(bg="white")
         
-        self.game = WumpusGame(size, pit_prob)
-        self.score = 0
-        self.size = size
+        # Game state, knowledge base and score live in the headless engine.
+        WumpusEngine.__init__(self, size, pit_prob)
         self.cell_width = 50.8
         self.cell_height = 37
         
-        # Tracking visited, safe cells, stench cells, etc.
-        self.visited = {(self.game.agent.x, self.game.agent.y)}
-        self.safe_set = {(self.game.agent.x, self.game.agent.y)}
-        self.visited_percepts = {}
-        self.stench_cells = set()
-        
-        # Knowledge dictionary
-        self.knowledge = {
-            (x, y): {'pit': 0.5, 'wumpus': 0.5}
-            for x in range(self.size)
-            for y in range(self.size)
-        }
-        self.knowledge[(0, 0)]['pit'] = 0
-        self.knowledge[(0, 0)]['wumpus'] = 0
-        
         self.action_delay = 5  # ms delay for auto-run steps
+        self.frame_rate = 30   # redraws per second in max-speed mode
+        self.fast_forward = False
+        self.last_frame = 0.0
         
         # Iteration mode variables
         self.iteration_mode = False
         self.iterations_to_run = 0
         self.current_iteration = 0
-        self.iteration_scores = []
-        self.iteration_wins = []
-        self.iteration_outcomes = []
-        self.iteration_times = []
+        # Only running totals stay in memory; each episode is appended to
+        # the iteration log as it finishes.
+        self.iteration_score_total = 0
+        self.iteration_win_count = 0
+        self.iteration_seed = 0
+        self.iteration_log = None
         self.start_time = None
+        # Charts and the results file are written by a background process.
+        self.reports = ReportWorker()
         
         self.build_gui()
+        self.build_grid_items()
+        self.reset_visited_display()
         self.draw_grid()
         self.update_status()
         self.update_visited_display()
@@ -137,6 +133,16 @@ class WumpusGameGUI_Auto:
                                          text="Automate", font=("Arial", 12),
                                          command=self.start_automation)
         self.automate_button.pack(side="top", pady=5)
+        self.max_speed = tk.BooleanVar(value=False)
+        self.max_speed_check = tk.Checkbutton(self.right_button_frame,
+                                              text="Max speed", font=("Arial", 10),
+                                              variable=self.max_speed, bg="white")
+        self.max_speed_check.pack(side="top", pady=2)
+        self.profile = tk.BooleanVar(value=False)
+        self.profile_check = tk.Checkbutton(self.right_button_frame,
+                                            text="Profile iterations", font=("Arial", 10),
+                                            variable=self.profile, bg="white")
+        self.profile_check.pack(side="top", pady=2)
         self.exit_button = tk.Button(self.right_button_frame,
                                      text="Exit", font=("Arial", 12),
                                      command=self.exit_game)
@@ -239,45 +245,75 @@ class WumpusGameGUI_Auto:
         else:
             self.iteration_progress_label.config(text="")
 
-    def draw_grid(self):
+    def build_grid_items(self):
+        """
+        Create one persistent rectangle and label per cell, plus the agent
+        arrow. draw_grid then only reconfigures what changed.
+        """
         self.canvas.delete("all")
+        self.cell_items = {}
         for x in range(self.size):
             for y in range(self.size):
                 cx0 = x * self.cell_width
                 cy0 = (self.size - 1 - y) * self.cell_height
                 cx1 = (x + 1) * self.cell_width
                 cy1 = (self.size - y) * self.cell_height
+                rect = self.canvas.create_rectangle(cx0, cy0, cx1, cy1,
+                                                    fill="white", outline="black")
+                text = self.canvas.create_text(cx0 + self.cell_width/2,
+                                               cy1 - 10,
+                                               text="",
+                                               fill="black",
+                                               font=("Arial", 10, "bold"))
+                self.cell_items[(x, y)] = (rect, text)
+        self.agent_item = self.canvas.create_line(0, 0, 0, 0, arrow=tk.LAST,
+                                                  fill="blue", width=2)
+        self.drawn_cells = {}
+        self.dirty_cells = set(self.cell_items)
+
+    def cell_changed(self, cell):
+        # Redraw this cell (and its visited-list row) on the next update.
+        self.dirty_cells.add(cell)
+        self.dirty_rows.add(cell)
+
+    def cell_appearance(self, cell):
+        # Color the cell if visited
+        if cell in self.visited:
+            percepts = self.visited_percepts.get(cell, [])
+            if "glitter" in percepts:
+                fill_color = "yellow"
+            elif "breeze" in percepts:
+                fill_color = "light blue"
+            elif "stench" in percepts:
+                fill_color = "light coral"
+            else:
+                fill_color = "light green"
+        else:
+            fill_color = "white"
+
+        # Display the percept text if visited
+        label_strs = ""
+        if cell in self.visited_percepts:
+            ptext = self.visited_percepts[cell]
+            if ptext:
+                label_strs = ", ".join(ptext)
+            else:
+                label_strs = "empty"
+        return fill_color, label_strs
 
-                # Color the cell if visited
-                if (x, y) in self.visited:
-                    percepts = self.visited_percepts.get((x, y), [])
-                    if "glitter" in percepts:
-                        fill_color = "yellow"
-                    elif "breeze" in percepts:
-                        fill_color = "light blue"
-                    elif "stench" in percepts:
-                        fill_color = "light coral"
-                    else:
-                        fill_color = "light green"
-                else:
-                    fill_color = "white"
-
-                self.canvas.create_rectangle(cx0, cy0, cx1, cy1,
-                                             fill=fill_color, outline="black")
-
-                # Optionally display the percept text if visited
-                if (x, y) in self.visited_percepts:
-                    ptext = self.visited_percepts[(x, y)]
-                    if ptext:
-                        label_strs = ", ".join(ptext)
-                    else:
-                        label_strs = "empty"
-                    self.canvas.create_text(cx0 + self.cell_width/2,
-                                            cy1 - 10,
-                                            text=label_strs,
-                                            fill="black",
-                                            font=("Arial", 10, "bold"))
-        # Draw the agent arrow
+    def draw_grid(self):
+        # Only cells marked dirty since the last draw are reconfigured.
+        for cell in self.dirty_cells:
+            appearance = self.cell_appearance(cell)
+            if self.drawn_cells.get(cell) != appearance:
+                fill_color, label_strs = appearance
+                rect, text = self.cell_items[cell]
+                self.canvas.itemconfig(rect, fill=fill_color)
+                self.canvas.itemconfig(text, text=label_strs)
+                self.drawn_cells[cell] = appearance
+        self.dirty_cells.clear()
+
+        # Move the agent arrow
         ax, ay = self.game.agent.x, self.game.agent.y
         center_x = ax * self.cell_width + self.cell_width/2
         center_y = (self.size - 1 - ay) * self.cell_height + self.cell_height/2
@@ -292,132 +328,54 @@ class WumpusGameGUI_Auto:
         else:  # 'W'
             dx, dy = -arrow_len, 0
 
-        self.canvas.create_line(center_x, center_y,
-                                center_x + dx, center_y + dy,
-                                arrow=tk.LAST, fill="blue", width=2)
-        self.canvas.update()
+        self.canvas.coords(self.agent_item, center_x, center_y,
+                           center_x + dx, center_y + dy)
 
-    def update_visited_display(self):
+    def reset_visited_display(self):
+        # Empty the visited list; every visited cell is re-added on the next update.
         self.visited_listbox.delete(0, tk.END)
-        for cell in sorted(self.visited, reverse=True):
+        self.listed_keys = []
+        self.listed_entries = []
+        self.dirty_rows = set(self.visited)
+
+    def update_visited_display(self):
+        """
+        Keep the visited list sorted (highest cell first) without rebuilding
+        it: new cells are inserted at their sorted position and only rows
+        whose percepts changed are rewritten.
+        """
+        for cell in self.dirty_rows:
+            if cell not in self.visited:
+                continue
             per = self.visited_percepts.get(cell, [])
             entry = f"{cell}: {', '.join(per) if per else 'empty'}"
-            self.visited_listbox.insert(tk.END, entry)
-
-    # ------------------- Knowledge / Inference Logic -------------------
-    def record_percepts(self, x, y):
-        per = self.game.world.get_percepts(x, y)
-        self.visited_percepts[(x, y)] = per
-        if "stench" in per:
-            self.stench_cells.add((x, y))
-
-    def update_knowledge(self):
-        changed = True
-        while changed:
-            changed = False
-            for (vx, vy) in self.visited:
-                per = self.visited_percepts.get((vx, vy), [])
-                neighbors = self.get_neighbors((vx, vy))
-
-                # If no stench, mark neighbors as safe from wumpus
-                if "stench" not in per:
-                    for n in neighbors:
-                        if self.knowledge[n]['wumpus'] != 0:
-                            self.knowledge[n]['wumpus'] = 0
-                            changed = True
-                else:
-                    # If exactly one unknown neighbor, that might be a wumpus
-                    uncertain = [n for n in neighbors if self.knowledge[n]['wumpus'] == 0.5]
-                    if len(uncertain) == 1:
-                        wn = uncertain[0]
-                        if self.knowledge[wn]['wumpus'] != 1:
-                            self.knowledge[wn]['wumpus'] = 1
-                            changed = True
-
-                # If no breeze, mark neighbors as safe from pit
-                if "breeze" not in per:
-                    for n in neighbors:
-                        if self.knowledge[n]['pit'] != 0:
-                            self.knowledge[n]['pit'] = 0
-                            changed = True
-                else:
-                    # If exactly one unknown neighbor, that might be a pit
-                    uncertain = [n for n in neighbors if self.knowledge[n]['pit'] == 0.5]
-                    if len(uncertain) == 1:
-                        pn = uncertain[0]
-                        if self.knowledge[pn]['pit'] != 1:
-                            self.knowledge[pn]['pit'] = 1
-                            changed = True
-
-            # If a cell is known safe, add to self.safe_set
-            for cell, info in self.knowledge.items():
-                if info['pit'] == 0 and info['wumpus'] == 0 and cell not in self.safe_set:
-                    self.safe_set.add(cell)
-                    changed = True
-
-    def get_neighbors(self, pos):
-        x, y = pos
-        nbrs = []
-        for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
-            nx, ny = x+dx, y+dy
-            if 0 <= nx < self.size and 0 <= ny < self.size:
-                nbrs.append((nx, ny))
-        return nbrs
-
-    def vantage_spots(self, wx, wy):
-        vantage = []
-        for vx in range(self.size):
-            vantage.append((vx, wy))
-        for vy in range(self.size):
-            vantage.append((wx, vy))
-        return list(set(vantage))
-
-    def find_path_to_any(self, start, candidates):
-        from collections import deque
-        queue = deque([[start]])
-        visited = {start}
-        while queue:
-            path = queue.popleft()
-            if path[-1] in candidates:
-                return path
-            for nb in self.get_neighbors(path[-1]):
-                if nb not in visited:
-                    if self.knowledge[nb]['pit'] == 0 and self.knowledge[nb]['wumpus'] == 0:
-                        visited.add(nb)
-                        queue.append(path + [nb])
-        return None
-
-    def find_path_knowledge(self, start, goals):
-        from collections import deque
-        queue = deque([[start]])
-        visited = {start}
-        while queue:
-            path = queue.popleft()
-            if path[-1] in goals:
-                return path
-            for neighbor in self.get_neighbors(path[-1]):
-                if neighbor not in visited:
-                    if (self.knowledge[neighbor]['pit'] == 0 and
-                        self.knowledge[neighbor]['wumpus'] == 0):
-                        visited.add(neighbor)
-                        queue.append(path + [neighbor])
-        return None
-
-    def find_path_ground_truth(self, start, goal):
-        from collections import deque
-        visited = {start}
-        queue = deque([[start]])
-        while queue:
-            path = queue.popleft()
-            if path[-1] == goal:
-                return path
-            for neighbor in self.get_neighbors(path[-1]):
-                if neighbor not in visited:
-                    cell = self.game.world.grid[neighbor[0]][neighbor[1]]
-                    if not cell.has_pit and not cell.has_wumpus:
-                        visited.add(neighbor)
-                        queue.append(path + [neighbor])
-        return None
+            key = (-cell[0], -cell[1])
+            i = bisect_left(self.listed_keys, key)
+            if i < len(self.listed_keys) and self.listed_keys[i] == key:
+                if self.listed_entries[i] != entry:
+                    self.visited_listbox.delete(i)
+                    self.visited_listbox.insert(i, entry)
+                    self.listed_entries[i] = entry
+            else:
+                self.listed_keys.insert(i, key)
+                self.listed_entries.insert(i, entry)
+                self.visited_listbox.insert(i, entry)
+        self.dirty_rows.clear()
+
+    def refresh(self):
+        # In max-speed mode the screen is only redrawn once per frame.
+        if self.fast_forward:
+            return
+        self.update_status()
+        self.draw_grid()
+
+    def on_game_over(self, victory=False):
+        if self.iteration_mode:
+            return
+        if victory:
+            messagebox.showinfo("Victory",
+                f"You killed all Wumpuses and grabbed the gold!\nFinal Score: {self.score}")
+        self.master.after(2000, self.master.destroy)
 
     # ------------------- Iteration Mode Functions -------------------
     def run_iterations(self):
@@ -428,339 +386,120 @@ class WumpusGameGUI_Auto:
             return
         self.iterations_to_run = iters
         self.current_iteration = 0
-        self.iteration_scores = []
-        self.iteration_wins = []
-        self.iteration_outcomes = []
-        self.iteration_times = []
+        self.iteration_score_total = 0
+        self.iteration_win_count = 0
+        self.iteration_seed = random.getrandbits(32)
+        if self.iteration_log is not None:
+            self.iteration_log.close()
+        self.iteration_log = EpisodeLogWriter(new_log_path("iterations"))
         self.iteration_mode = True
+        if self.profiler is not None:
+            self.profiler.detach(self)
+        if self.profile.get():
+            PhaseProfiler().attach(self)
         self.start_time = time.time()
-        self.restart_game()
+        self.restart_iteration()
         self.auto_run()
 
     def iteration_finished(self):
         win = (self.game.agent.has_gold and
                (self.game.world.count_wumpuses() == 0))
-        self.iteration_scores.append(self.score)
-        self.iteration_wins.append(win)
-        outcome = "win" if win else "loose"
-        self.iteration_outcomes.append(f"itr-{self.current_iteration + 1}: {outcome}")
         iter_time = time.time() - self.start_time
-        self.iteration_times.append(iter_time)
+        self.iteration_score_total += self.score
+        self.iteration_win_count += bool(win)
+        self.iteration_log.append(episode_seed(self.iteration_seed, self.current_iteration),
+                                  self.score, win, self.steps, self.arrows_used(), iter_time)
         self.current_iteration += 1
+        if self.profiler is not None:
+            self.profiler.end_episode(self, iter_time)
 
         if self.current_iteration < self.iterations_to_run:
-            self.restart_game()
+            self.restart_iteration()
             self.start_time = time.time()
-            self.master.after(500, self.auto_run)
+            self.master.after(0 if self.max_speed.get() else 500, self.auto_run)
         else:
-            avg = sum(self.iteration_scores) / len(self.iteration_scores)
-            wr = sum(1 for w in self.iteration_wins if w) / len(self.iteration_wins) * 100
-            details = "\n".join(self.iteration_outcomes)
-
-            # Bar chart
-            win_count = sum(1 for outcome in self.iteration_outcomes
-                            if "win" in outcome.lower())
-            loss_count = self.iterations_to_run - win_count
-            outcomes = ["Wins", "Losses"]
-            counts = [win_count, loss_count]
-            plt.figure(figsize=(6, 4), dpi=300)
-            bars = plt.bar(outcomes, counts, color=["green", "red"])
-            plt.title(f"Iteration Outcomes ({self.iterations_to_run} Iterations)",
-                      fontsize=18)
-            plt.xlabel("Outcome", fontsize=16)
-            plt.ylabel("Count", fontsize=16)
-            plt.ylim(0, max(counts) + 1)
-            for bar, cnt in zip(bars, counts):
-                plt.text(bar.get_x() + bar.get_width()/2, bar.get_height(), f'{cnt}',
-                         ha='center', va='bottom', fontsize=14)
-            plt.tight_layout()
-            plt.savefig("Results\Graphs\iteration_result.png", dpi=300)
-            plt.close()
-
-            # Scatter plot for iteration times
-            iterations = list(range(1, self.iterations_to_run + 1))
-            plt.figure(figsize=(6, 4), dpi=300)
-            plt.scatter(iterations, self.iteration_times, color="blue")
-            plt.plot(iterations, self.iteration_times, linestyle="--", color="blue")
-            plt.title(f"Iteration Time per Iteration ({self.iterations_to_run} Iterations)",
-                      fontsize=18)
-            plt.xlabel("Iteration Number", fontsize=16)
-            plt.ylabel("Time (seconds)", fontsize=16)
-            plt.tight_layout()
-            plt.savefig("Results\Timing\iteration_times.png", dpi=300)
-            plt.close()
-
-            messagebox.showinfo("Iteration Results",
-                f"Iterations: {self.iterations_to_run}\n"
-                f"Average Score: {avg:.2f}\nWin Rate: {wr:.2f}%\n\nDetails:\n{details}")
-            
-            results = {
-                "iterations": self.iterations_to_run,
-                "win_rate": wr,
-                "avg_score": avg,
-                "outcomes": self.iteration_outcomes,
-                "iteration_times": self.iteration_times
-            }
-            with open("iteration_results.pkl", "wb") as f:
-                pickle.dump(results, f)
+            self.iteration_log.close()
+            results = results_summary(self.current_iteration, self.iteration_win_count,
+                                      self.iteration_score_total, self.iteration_log.path)
+            self.iteration_log = None
+            avg = results["avg_score"]
+            wr = results["win_rate"]
+            if self.profiler is not None:
+                results["profile"] = self.profiler.to_dict()
+                self.profiler.detach(self)
+            self.display_message(f"Iterations: {self.iterations_to_run} | "
+                                 f"Average Score: {avg:.2f} | Win Rate: {wr:.2f}%")
+            self.iteration_progress_label.config(text="Writing report...")
+            self.reports.submit(results)
+            self.master.after(100, self.poll_reports)
             self.iteration_mode = False
 
+    def poll_reports(self):
+        """Show the report worker's progress until the report is written."""
+        for kind, payload in self.reports.poll():
+            if kind == "progress":
+                self.iteration_progress_label.config(text=payload)
+            elif kind == "done":
+                self.iteration_progress_label.config(text="Report saved to Results")
+                return
+            else:
+                self.iteration_progress_label.config(text=f"Report failed: {payload}")
+                return
+        self.master.after(100, self.poll_reports)
+
     def auto_run(self):
         """Auto-run loop for AI moves."""
         if self.game.game_over:
             if self.iteration_mode:
                 self.iteration_finished()
             return
-        self.update_knowledge()
-        decision, param = self.choose_next_move()
+        if self.max_speed.get():
+            self.fast_tick()
+            return
+        decision = self.step()
         if decision == "wait":
-            self.display_message("No safe moves - waiting... Loss.", "orange")
-            self.game.game_over = True
             if self.iteration_mode:
                 self.iteration_finished()
             return
-        self.execute_action(decision, param)
-
-        ax, ay = self.game.agent.x, self.game.agent.y
-        self.visited.add((ax, ay))
-        self.record_percepts(ax, ay)
-        if decision == "shoot" and not self.game.world.count_wumpuses():
-            # Re-record stench for all visited cells if all wumpuses are dead
-            for cell in self.visited:
-                self.record_percepts(cell[0], cell[1])
 
         self.update_status()
         self.draw_grid()
         self.update_visited_display()
         self.master.after(self.action_delay, self.auto_run)
 
-    def start_automation(self):
-        """Start auto-run after a short delay."""
-        self.master.after(self.action_delay, self.auto_run)
-
-    # ------------------- Decision Logic for Auto Mode -------------------
-    def choose_next_move(self):
-        agent = self.game.agent
-        current = (agent.x, agent.y)
-        wcount = self.game.world.count_wumpuses()
-
-        # If agent has gold and no wumpuses => go home
-        if agent.has_gold and wcount == 0:
-            if current == (0, 0):
-                return ("exit", None)
-            p = self.find_path_ground_truth(current, (0, 0))
-            if p and len(p) > 1:
-                return ("move", p[1])
-            else:
-                return ("wait", None)
-        
-        # If current cell has gold => grab
-        if "glitter" in self.game.world.get_percepts(*current):
-            return ("grab", None)
-        
-        # Attempt to shoot a known wumpus if possible
-        known_wumpus = [c for c, inf in self.knowledge.items() if inf['wumpus'] == 1]
-        if known_wumpus and agent.arrows > 0:
-            candidate = None
-            max_cnt = 0
-            for c in known_wumpus:
-                # Count how many stench cells are next to c
-                cnt = sum(1 for s in self.stench_cells if c in self.get_neighbors(s))
-                if cnt > max_cnt:
-                    max_cnt = cnt
-                    candidate = c
-            if candidate:
-                (wx, wy) = candidate
-                # If aligned => shoot
-                if wx == agent.x or wy == agent.y:
-                    if wx == agent.x:
-                        return ("shoot", 'N' if wy > agent.y else 'S')
-                    else:
-                        return ("shoot", 'E' if wx > agent.x else 'W')
-                else:
-                    # Move to vantage spot
-                    vantage = [v for v in self.vantage_spots(wx, wy) if v in self.safe_set]
-                    path = self.find_path_to_any(current, vantage)
-                    if path and len(path) > 1:
-                        return ("move", path[1])
-                    return ("wait", None)
-        
-        # Otherwise, move to a safe, unvisited neighbor
-        neighbors = self.get_neighbors(current)
-        safe_nbr = [n for n in neighbors if n in self.safe_set and n not in self.visited]
-        if safe_nbr:
-            return ("move", safe_nbr[0])
-
-        # BFS to any unvisited safe cell
-        unvisited = [c for c in self.safe_set if c not in self.visited]
-        if unvisited:
-            p = self.find_path_knowledge(current, unvisited)
-            if p and len(p) > 1:
-                return ("move", p[1])
-
-        # No safe moves => wait => treat as loss
-        return ("wait", None)
-
-    def execute_action(self, action, param):
-        if action == "move":
-            # For auto-run, we do the existing move approach
-            self.turn_to_cell(param)
-            self.move_auto()
-        elif action == "grab":
-            self.grab()
-        elif action == "shoot":
-            if self.game.agent.arrows > 0:
-                self.game.agent.orientation = param
-                self.update_status()
-                self.draw_grid()
-                self.shoot()
-        elif action == "exit":
-            self.exit_game()
-        elif action == "wait":
-            self.display_message("No safe moves - waiting... Loss.", "orange")
-            self.game.game_over = True
-            if self.iteration_mode:
-                self.iteration_finished()
-
-    def turn_to_cell(self, cell):
-        """For auto-run: turn to face the next cell if needed, then move."""
-        ax, ay = self.game.agent.x, self.game.agent.y
-        cx, cy = cell
-        desired = None
-        if cx > ax:
-            desired = 'E'
-        elif cx < ax:
-            desired = 'W'
-        elif cy > ay:
-            desired = 'N'
-        elif cy < ay:
-            desired = 'S'
-        if desired and self.game.agent.orientation != desired:
-            self.game.agent.orientation = desired
-            self.update_status()
-            self.draw_grid()
-
-    def move_auto(self):
-        """Auto-run movement logic (the old 'move' function)."""
-        if self.game.game_over:
-            return
-        bump = self.game.agent.move_forward(self.game.world)
-        self.score -= 1
-        if bump:
-            self.display_message("Bumped into a wall!", "orange")
-        else:
-            if self.check_for_hazard():
-                self.update_status()
-                self.draw_grid()
-                return
-            self.display_message("Moved safely.", "black")
+    def fast_tick(self):
+        """
+        Max-speed mode: run agent steps until the next frame is due, then
+        draw only the latest state. The simulation fills the time between
+        frames instead of waiting one Tk callback per action.
+        """
+        deadline = self.last_frame + 1.0 / self.frame_rate
+        self.fast_forward = True
+        try:
+            self.step()
+            while not self.game.game_over and time.perf_counter() < deadline:
+                self.step()
+        finally:
+            self.fast_forward = False
         self.update_status()
         self.draw_grid()
-        self.check_win_condition()
+        self.update_visited_display()
+        self.last_frame = time.perf_counter()
+        self.master.after(1, self.auto_run)
 
-    # ------------------- Basic Game Actions -------------------
-    def check_for_hazard(self):
-        cell = self.game.world.grid[self.game.agent.x][self.game.agent.y]
-        if cell.has_pit:
-            self.game.agent.alive = False
-            self.game.game_over = True
-            self.score -= 1000
-            self.display_message("You fell into a pit! Game Over.", "red")
-            if not self.iteration_mode:
-                self.master.after(2000, self.master.destroy)
-            return True
-        if cell.has_wumpus:
-            self.game.agent.alive = False
-            self.game.game_over = True
-            self.score -= 1000
-            self.display_message("You encountered a live Wumpus! Game Over.", "red")
-            if not self.iteration_mode:
-                self.master.after(2000, self.master.destroy)
-            return True
-        return False
-
-    def check_win_condition(self):
-        if (self.game.agent.has_gold and
-            self.game.world.count_wumpuses() == 0 and
-            not self.game.game_over):
-            self.game.game_over = True
-            if not self.iteration_mode:
-                messagebox.showinfo("Victory",
-                    f"You killed all Wumpuses and grabbed the gold!\nFinal Score: {self.score}")
-                self.master.after(2000, self.master.destroy)
-
-    def shoot(self):
-        if self.game.game_over:
-            return
-        if self.game.agent.arrows <= 0:
-            self.display_message("No arrows left!", "orange")
-            return
-        self.score -= 10
-        self.game.agent.arrows -= 1
-        x, y = self.game.agent.x, self.game.agent.y
-        orientation = self.game.agent.orientation
-        killed, posk = self.game.world.shoot_arrow(x, y, orientation)
-        if killed:
-            self.display_message("You killed a Wumpus!", "green")
-            self.score += 100
-            if posk:
-                # Remove stench from neighbors
-                for nb in self.get_neighbors(posk):
-                    if nb in self.visited_percepts and "stench" in self.visited_percepts[nb]:
-                        self.visited_percepts[nb].remove("stench")
-        else:
-            self.display_message("You missed! Game Over.", "red")
-            self.score -= 1000
-            self.game.game_over = True
-            self.update_status()
-            self.draw_grid()
-            if not self.iteration_mode:
-                self.master.after(2000, self.master.destroy)
-            return
-        self.update_status()
-        self.check_win_condition()
+    def start_automation(self):
+        """Start auto-run after a short delay."""
+        self.master.after(self.action_delay, self.auto_run)
 
-    def grab(self):
-        if self.game.game_over:
-            return
-        cell = self.game.world.grid[self.game.agent.x][self.game.agent.y]
-        if cell.has_gold:
-            cell.has_gold = False
-            self.game.agent.has_gold = True
-            self.display_message("You picked up the gold!", "green")
-            self.score += 500
-        else:
-            self.display_message("No gold here!", "orange")
-        self.update_status()
-        self.draw_grid()
-        self.check_win_condition()
+    def restart_iteration(self):
+        # Seed the board from the run seed and the iteration number, so the
+        # seed in the log reproduces it.
+        self.restart_game(episode_seed(self.iteration_seed, self.current_iteration))
 
-    def exit_game(self):
-        if self.game.game_over:
-            return
-        if self.game.agent.has_gold and self.game.world.count_wumpuses() == 0:
-            self.score += 1000
-            self.display_message("You exited with gold & all Wumpuses dead! Victory!", "green")
-        else:
-            self.display_message("Exited early. (Goal not fully met)", "black")
-        self.game.game_over = True
-        if not self.iteration_mode:
-            self.master.after(2000, self.master.destroy)
-
-    def restart_game(self):
-        self.game = WumpusGame(self.size, 0.2)
-        self.score = 0
-        self.visited = {(self.game.agent.x, self.game.agent.y)}
-        self.safe_set = {(self.game.agent.x, self.game.agent.y)}
-        self.visited_percepts = {}
-        self.stench_cells = set()
-        self.knowledge = {
-            (x, y): {'pit': 0.5, 'wumpus': 0.5}
-            for x in range(self.size)
-            for y in range(self.size)
-        }
-        self.knowledge[(0, 0)]['pit'] = 0
-        self.knowledge[(0, 0)]['wumpus'] = 0
+    def restart_game(self, seed=None):
+        self.new_game(seed=seed)
+        self.dirty_cells.update(self.cell_items)
+        self.reset_visited_display()
         self.update_status()
         self.draw_grid()
         self.update_visited_display()
@@ -0,0 +1,587 @@
+# knowledge.py
+from collections import deque
+from search import FlatSet
+
+# Every backend answers the same questions for the engine:
+# - observe(cell, percepts): the agent has visited `cell` and sensed `percepts`
+#   (called again with new percepts if they change, e.g. after a kill); the
+#   cell itself is known to be safe from then on
+# - kill(cell): a wumpus in `cell` was shot; the cell holds no live wumpus,
+#   whatever its neighbours still smell
+# - update(): run inference until nothing new can be deduced
+# - value(cell, hazard): 0 (ruled out), 1 (deduced) or 0.5 (unknown)
+# - known_wumpuses(): cells deduced to hold a wumpus, in (x, y) order
+# - safe_set: set of cells with both hazards ruled out
+# - safe_map: bytearray with safe_map[x * size + y] set for every safe cell
+# - safe_log: flat indices of the safe cells in the order they became safe
+# - set_limit(hazard, count): optional; how many of the hazard are left on
+#   the board, for backends that can use it
+
+# Knowledge of a cell nothing is known about yet (shared, never modified).
+UNKNOWN_CELL = {'pit': 0.5, 'wumpus': 0.5}
+
+# ------------------- RuleKnowledge Class -------------------
+class RuleKnowledge:
+    """
+    Per-cell knowledge dictionary with the agent's two rules per hazard:
+    no percept means the neighbours are safe, and a percept with exactly one
+    unknown neighbour means that neighbour holds the hazard. Inference is
+    driven by a worklist of visited cells whose rules must be re-checked.
+    Cells only get an entry in the dictionary once something is deduced
+    about them.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.visited = {(0, 0)}
+        self.percepts = {}
+        self.safe_set = {(0, 0)}
+        self.safe_map = self.new_safe_map()
+        self.safe_map[0] = 1
+        self.safe_log = [0]
+
+        # Knowledge dictionary
+        self.knowledge = {(0, 0): {'pit': 0, 'wumpus': 0}}
+        # Cells whose 'wumpus' value is 1.
+        self.known_wumpus = set()
+
+        # Visited cells whose rules must be re-checked by update().
+        self.pending = deque([(0, 0)])
+        self.pending_set = {(0, 0)}
+
+    def new_safe_map(self):
+        return bytearray(self.size * self.size)
+
+    def get_neighbors(self, pos):
+        x, y = pos
+        nbrs = []
+        for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
+            nx, ny = x+dx, y+dy
+            if 0 <= nx < self.size and 0 <= ny < self.size:
+                nbrs.append((nx, ny))
+        return nbrs
+
+    def observe(self, cell, percepts):
+        self.visited.add(cell)
+        self.percepts[cell] = percepts
+        # The agent survived the cell, so it holds neither hazard.
+        for hazard in ('pit', 'wumpus'):
+            if self.value(cell, hazard) != 0:
+                self.set_knowledge(cell, hazard, 0)
+        self.mark_pending(cell)
+
+    def kill(self, cell):
+        if self.value(cell, 'wumpus') != 0:
+            self.set_knowledge(cell, 'wumpus', 0)
+        # Its neighbours' stench may now point at another cell.
+        for n in self.get_neighbors(cell):
+            if n in self.visited:
+                self.mark_pending(n)
+
+    def mark_pending(self, cell):
+        # Queue a visited cell whose percepts (or neighbour knowledge) changed.
+        if cell not in self.pending_set:
+            self.pending_set.add(cell)
+            self.pending.append(cell)
+
+    def update(self):
+        """
+        Run the inference rules on the pending cells until nothing changes.
+
+        Only cells whose percepts changed, or whose neighbours' knowledge
+        changed, are re-checked, so the cost depends on what changed since
+        the last step rather than on the number of visited cells.
+        """
+        knowledge = self.knowledge
+        while self.pending:
+            cell = self.pending.popleft()
+            self.pending_set.discard(cell)
+            per = self.percepts.get(cell, ())
+            neighbors = self.get_neighbors(cell)
+            for hazard, percept in (('wumpus', 'stench'), ('pit', 'breeze')):
+                if percept not in per:
+                    # No percept: mark neighbors as safe from this hazard
+                    for n in neighbors:
+                        if knowledge.get(n, UNKNOWN_CELL)[hazard] != 0:
+                            self.set_knowledge(n, hazard, 0)
+                else:
+                    # If exactly one unknown neighbor, that must be the hazard
+                    uncertain = [n for n in neighbors
+                                 if knowledge.get(n, UNKNOWN_CELL)[hazard] == 0.5]
+                    if len(uncertain) == 1:
+                        self.set_knowledge(uncertain[0], hazard, 1)
+
+    def set_knowledge(self, cell, hazard, value):
+        info = self.knowledge.get(cell)
+        if info is None:
+            info = self.knowledge[cell] = dict(UNKNOWN_CELL)
+        old = info[hazard]
+        info[hazard] = value
+        if hazard == 'wumpus':
+            if value == 1:
+                self.known_wumpus.add(cell)
+            else:
+                self.known_wumpus.discard(cell)
+        if old == 0.5:
+            # One fewer unknown neighbour for every visited cell next to it.
+            for n in self.get_neighbors(cell):
+                if n in self.visited:
+                    self.mark_pending(n)
+        # If a cell is known safe, add to self.safe_set
+        if info['pit'] == 0 and info['wumpus'] == 0:
+            self.safe_set.add(cell)
+            idx = cell[0] * self.size + cell[1]
+            self.safe_map[idx] = 1
+            self.safe_log.append(idx)
+
+    def value(self, cell, hazard):
+        return self.knowledge.get(cell, UNKNOWN_CELL)[hazard]
+
+    def known_wumpuses(self):
+        return sorted(self.known_wumpus)
+
+# ------------------- SparseKnowledge Class -------------------
+class SparseKnowledge(RuleKnowledge):
+    """
+    RuleKnowledge with the safe cells kept in a FlatSet instead of a
+    size * size bytearray, so nothing is allocated per cell of the board.
+    Used for boards far larger than the area the agent explores.
+    """
+    def new_safe_map(self):
+        return FlatSet()
+
+# ------------------- BitboardKnowledge Class -------------------
+class BitboardKnowledge:
+    """
+    The same rules as RuleKnowledge, stored as one Python int per fact with
+    bit x * size + y standing for cell (x, y). Neighbour sets come from
+    shift-and-mask operations, so each rule is applied to the whole board in
+    a handful of big-int operations instead of cell by cell.
+    """
+    def __init__(self, size):
+        self.size = size
+        n = size * size
+        self.full = (1 << n) - 1
+        column = (1 << size) - 1
+        rows = sum(1 << (x * size) for x in range(size))
+        # Cells with y < size-1 (have a northern neighbour) and y > 0.
+        self.has_north = (column >> 1) * rows
+        self.has_south = ((column << 1) & column) * rows
+
+        self.visited = 1
+        self.stench = 0
+        self.breeze = 0
+        self.no_wumpus = 1
+        self.wumpus = 0
+        self.no_pit = 1
+        self.pit = 0
+        self.safe = 1
+        self.safe_set = {(0, 0)}
+        self.safe_map = bytearray(n)
+        self.safe_map[0] = 1
+        self.safe_log = [0]
+        self.dirty = True
+
+    def neighbor_shifts(self, bits):
+        """
+        Yield, for each of the four directions, the cells whose neighbour in
+        that direction is in `bits`.
+        """
+        yield (bits << self.size) & self.full
+        yield bits >> self.size
+        yield (bits << 1) & self.has_south
+        yield (bits >> 1) & self.has_north
+
+    def adjacent(self, bits):
+        # All cells next to at least one cell in `bits`.
+        out = 0
+        for shifted in self.neighbor_shifts(bits):
+            out |= shifted
+        return out
+
+    def exactly_one(self, bits):
+        # Cells with exactly one neighbour in `bits` (bit-sliced counter).
+        ones = twos = 0
+        for shifted in self.neighbor_shifts(bits):
+            twos |= ones & shifted
+            ones |= shifted
+        return ones & ~twos
+
+    def observe(self, cell, percepts):
+        bit = 1 << (cell[0] * self.size + cell[1])
+        self.visited |= bit
+        self.stench = (self.stench | bit) if "stench" in percepts else (self.stench & ~bit)
+        self.breeze = (self.breeze | bit) if "breeze" in percepts else (self.breeze & ~bit)
+        self.no_wumpus |= bit
+        self.no_pit |= bit
+        self.wumpus &= ~bit
+        self.pit &= ~bit
+        self.dirty = True
+
+    def kill(self, cell):
+        bit = 1 << (cell[0] * self.size + cell[1])
+        self.no_wumpus |= bit
+        self.wumpus &= ~bit
+        self.dirty = True
+
+    def update(self):
+        if not self.dirty:
+            return
+        self.dirty = False
+        self.no_wumpus, self.wumpus = self.infer(self.stench, self.no_wumpus, self.wumpus)
+        self.no_pit, self.pit = self.infer(self.breeze, self.no_pit, self.pit)
+
+        safe = self.no_pit & self.no_wumpus
+        new = safe & ~self.safe
+        self.safe = safe
+        while new:
+            low = new & -new
+            idx = low.bit_length() - 1
+            self.safe_set.add(divmod(idx, self.size))
+            self.safe_map[idx] = 1
+            self.safe_log.append(idx)
+            new ^= low
+
+    def infer(self, sensed, clear, found):
+        """
+        Apply both rules for one hazard to the whole board until nothing
+        changes. `sensed` holds the visited cells with the hazard's percept,
+        `clear` the cells ruled out and `found` the cells deduced to hold it.
+        """
+        clear |= self.adjacent(self.visited & ~sensed)
+        found &= ~clear
+        while True:
+            unknown = self.full & ~clear & ~found
+            firing = sensed & self.exactly_one(unknown)
+            new = self.adjacent(firing) & unknown
+            if not new:
+                return clear, found
+            found |= new
+
+    def value(self, cell, hazard):
+        bit = 1 << (cell[0] * self.size + cell[1])
+        if hazard == 'wumpus':
+            clear, found = self.no_wumpus, self.wumpus
+        else:
+            clear, found = self.no_pit, self.pit
+        if clear & bit:
+            return 0
+        return 1 if found & bit else 0.5
+
+    def known_wumpuses(self):
+        cells = []
+        bits = self.wumpus
+        while bits:
+            low = bits & -bits
+            cells.append(divmod(low.bit_length() - 1, self.size))
+            bits ^= low
+        return cells
+
+# ------------------- ClauseKnowledge Class -------------------
+# Literal values in ClauseKnowledge.values (literals not in it are UNKNOWN).
+UNKNOWN, TRUE, FALSE = 0, 1, 2
+
+class ClauseKnowledge:
+    """
+    Clause store with watched-literal unit propagation.
+
+    Every cell has a pit variable (x * size + y) and a wumpus variable
+    (size * size + x * size + y); literal 2 * var means the hazard is there
+    and 2 * var + 1 that it is not. A percept adds the clause "one of my
+    neighbours holds the hazard", no percept adds the negative unit for
+    every neighbour, and a visited cell is safe. Each clause watches two of
+    its literals and is only looked at when one of them becomes false, so
+    propagation work follows what changed since the last step. Literal
+    values and watch lists are dictionaries keyed by literal, so only the
+    cells the agent has reasoned about take any memory.
+
+    On top of the clauses, set_limit(hazard, count) gives the number of
+    hazards left on the board. Once that many are deduced, every other cell
+    is clear of it, which the two per-cell rules can never conclude.
+
+    Wumpus variables mean "a live wumpus". kill(cell) undoes that cell's
+    deduction and re-attaches the clauses it satisfied. Every other fact
+    stays true after a kill, so when a stench goes away the cell's clause
+    is simply deleted.
+    """
+    def __init__(self, size):
+        self.size = size
+        n = size * size
+        self.n = n
+        # Value of every assigned literal (TRUE or FALSE).
+        self.values = {}
+        # Clauses as literal lists; positions 0 and 1 are the watched ones.
+        self.clauses = []
+        self.deleted = []
+        # Clauses watching each literal.
+        self.watches = {}
+        # Wumpus clause of each cell with a stench.
+        self.stench_clause = {}
+        self.trail = []
+        self.head = 0
+        self.pending_units = []
+        self.pending_clauses = []
+        # (clause, literal) pairs whose watch on the literal was dropped by a kill.
+        self.pending_rewatch = []
+        # Hazards deduced and hazards left on the board, by base variable.
+        self.found = {0: 0, n: 0}
+        self.limit = {0: None, n: None}
+        self.closed = {0: False, n: False}
+
+        self.visited = set()
+        self.percepts = {}
+        self.safe_set = set()
+        self.safe_map = bytearray(n)
+        self.safe_log = []
+        self.known_wumpus = set()
+        self.observe((0, 0), ())
+        self.update()
+
+    def get_neighbors(self, pos):
+        x, y = pos
+        nbrs = []
+        for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
+            nx, ny = x+dx, y+dy
+            if 0 <= nx < self.size and 0 <= ny < self.size:
+                nbrs.append((nx, ny))
+        return nbrs
+
+    def observe(self, cell, percepts):
+        idx = cell[0] * self.size + cell[1]
+        nbrs = [x * self.size + y for x, y in self.get_neighbors(cell)]
+        old = self.percepts.get(cell)
+        self.percepts[cell] = percepts
+        if cell not in self.visited:
+            self.visited.add(cell)
+            self.pending_units.append(2 * idx + 1)
+            self.pending_units.append(2 * (self.n + idx) + 1)
+            for base, percept in ((0, "breeze"), (self.n, "stench")):
+                if percept in percepts:
+                    clause = [2 * (base + nb) for nb in nbrs]
+                    if base:
+                        self.stench_clause[cell] = len(self.clauses) + len(self.pending_clauses)
+                    self.pending_clauses.append(clause)
+                else:
+                    self.pending_units.extend(2 * (base + nb) + 1 for nb in nbrs)
+        elif "stench" in old and "stench" not in percepts:
+            self.retract_stench(cell)
+            self.pending_units.extend(2 * (self.n + nb) + 1 for nb in nbrs)
+
+    def kill(self, cell):
+        lit = 2 * (self.n + cell[0] * self.size + cell[1])
+        values = self.values
+        value = values.get(lit, UNKNOWN)
+        if value == TRUE:
+            # Undo the deduction; the clauses it satisfied are watched again.
+            del values[lit], values[lit + 1]
+            self.known_wumpus.discard(cell)
+            self.found[self.n] -= 1
+            self.assign(lit + 1)
+            # Re-attached by update(), once clauses the kill made stale are deleted.
+            self.pending_rewatch.extend((cid, lit) for cid in self.watches.pop(lit, ()))
+        elif value == UNKNOWN:
+            self.assign(lit + 1)
+
+    def retract_stench(self, cell):
+        # Delete the cell's stench clause; its watches are dropped lazily.
+        cid = self.stench_clause.pop(cell)
+        if cid < len(self.clauses):
+            self.deleted[cid] = True
+        else:
+            self.pending_clauses[cid - len(self.clauses)] = None
+
+    def set_limit(self, hazard, count):
+        """Tell the store how many of `hazard` are left on the board."""
+        base = self.n if hazard == 'wumpus' else 0
+        self.limit[base] = count
+
+    def update(self):
+        rewatch, self.pending_rewatch = self.pending_rewatch, []
+        for cid, lit in rewatch:
+            if not self.deleted[cid]:
+                self.reattach(cid, lit)
+        units, self.pending_units = self.pending_units, []
+        for lit in units:
+            self.assign(lit)
+        clauses, self.pending_clauses = self.pending_clauses, []
+        for clause in clauses:
+            self.clauses.append(clause)
+            self.deleted.append(clause is None)
+            if clause is not None:
+                self.attach(len(self.clauses) - 1)
+        while True:
+            self.propagate()
+            if not self.close_hazards():
+                return
+
+    def assign(self, lit):
+        values = self.values
+        if lit in values:
+            return
+        values[lit] = TRUE
+        values[lit ^ 1] = FALSE
+        self.trail.append(lit)
+        var = lit >> 1
+        base = self.n if var >= self.n else 0
+        idx = var - base
+        if lit & 1:
+            # Cleared of one hazard; safe once the other is cleared too.
+            other = 2 * ((idx + self.n) if base == 0 else idx) + 1
+            if values.get(other) == TRUE and not self.safe_map[idx]:
+                self.safe_map[idx] = 1
+                self.safe_set.add(divmod(idx, self.size))
+                self.safe_log.append(idx)
+        else:
+            self.found[base] += 1
+            if base:
+                self.known_wumpus.add(divmod(idx, self.size))
+
+    def attach(self, cid):
+        # Watch two literals that are not false.
+        clause = self.clauses[cid]
+        values = self.values
+        clause.sort(key=lambda lit: values.get(lit) == FALSE)
+        if len(clause) > 1:
+            self.watches.setdefault(clause[0], []).append(cid)
+            self.watches.setdefault(clause[1], []).append(cid)
+        if clause[0] not in values and (len(clause) == 1 or values.get(clause[1]) == FALSE):
+            self.assign(clause[0])
+
+    def reattach(self, cid, dropped):
+        # Drop a clause's remaining watch (the one on `dropped` is gone) and attach it again.
+        clause = self.clauses[cid]
+        other = clause[1] if clause[0] == dropped else clause[0]
+        self.watches[other].remove(cid)
+        self.attach(cid)
+
+    def propagate(self):
+        values = self.values
+        clauses = self.clauses
+        watches = self.watches
+        trail = self.trail
+        while self.head < len(trail):
+            lit = trail[self.head]
+            self.head += 1
+            false_lit = lit ^ 1
+            if values.get(false_lit) != FALSE:
+                continue  # undone since it was queued
+            watching = watches.get(false_lit)
+            if not watching:
+                continue
+            keep = []
+            for cid in watching:
+                if self.deleted[cid]:
+                    continue
+                clause = clauses[cid]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                if values.get(clause[0]) == TRUE:
+                    keep.append(cid)
+                    continue
+                for k in range(2, len(clause)):
+                    if values.get(clause[k]) != FALSE:
+                        clause[1], clause[k] = clause[k], false_lit
+                        watches.setdefault(clause[1], []).append(cid)
+                        break
+                else:
+                    keep.append(cid)
+                    if clause[0] not in values:
+                        self.assign(clause[0])
+            watches[false_lit] = keep
+
+    def close_hazards(self):
+        """
+        Clear every undecided cell of a hazard whose remaining count has
+        been reached. Returns True if that assigned anything.
+        """
+        changed = False
+        for base in (0, self.n):
+            limit = self.limit[base]
+            if limit is None or self.closed[base] or self.found[base] < limit:
+                continue
+            self.closed[base] = True
+            values = self.values
+            for var in range(base, base + self.n):
+                if 2 * var not in values:
+                    self.assign(2 * var + 1)
+                    changed = True
+        return changed
+
+    def value(self, cell, hazard):
+        var = cell[0] * self.size + cell[1]
+        if hazard == 'wumpus':
+            var += self.n
+        v = self.values.get(2 * var, UNKNOWN)
+        if v == UNKNOWN:
+            return 0.5
+        return 1 if v == TRUE else 0
+
+    def known_wumpuses(self):
+        return sorted(self.known_wumpus)
+
+# Inference backends selectable by name (WumpusEngine's `knowledge` option).
+BACKENDS = {
+    "rules": RuleKnowledge,
+    "bitboard": BitboardKnowledge,
+    "clauses": ClauseKnowledge,
+    "sparse": SparseKnowledge,
+}
+
+# ------------------- Main Entry Point -------------------
+if __name__ == '__main__':
+    import argparse
+    import time
+    from engine import WumpusEngine
+
+    parser = argparse.ArgumentParser(
+        description="Feed every backend the same percepts and compare their cost and deductions.")
+    parser.add_argument("episodes", type=int, nargs="?", default=20)
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--agent", choices=sorted(BACKENDS), default="rules",
+                        help="backend whose knowledge drives the agent")
+    args = parser.parse_args()
+
+    names = sorted(BACKENDS)
+    elapsed = dict.fromkeys(names, 0.0)
+    safe_cells = dict.fromkeys(names, 0)
+    wumpus_cells = dict.fromkeys(names, 0)
+    steps = 0
+    engine = WumpusEngine(size=args.size, knowledge=args.agent)
+    for i in range(args.episodes):
+        engine.new_game(seed=i)
+        backends = {name: BACKENDS[name](args.size) for name in names}
+
+        def observe_all(cell, percepts, observe=engine.knowledge.observe, backends=backends):
+            observe(cell, percepts)
+            for name, backend in backends.items():
+                start = time.perf_counter()
+                backend.observe(cell, percepts)
+                elapsed[name] += time.perf_counter() - start
+        engine.knowledge.observe = observe_all
+
+        def kill_all(cell, kill=engine.knowledge.kill, backends=backends):
+            kill(cell)
+            for name, backend in backends.items():
+                start = time.perf_counter()
+                backend.kill(cell)
+                elapsed[name] += time.perf_counter() - start
+        engine.knowledge.kill = kill_all
+
+        world = engine.game.world
+        while not engine.game.game_over:
+            for name, backend in backends.items():
+                start = time.perf_counter()
+                if hasattr(backend, "set_limit"):
+                    backend.set_limit('pit', world.count_pits())
+                    backend.set_limit('wumpus', world.count_wumpuses())
+                backend.update()
+                elapsed[name] += time.perf_counter() - start
+                safe_cells[name] += len(backend.safe_set)
+                wumpus_cells[name] += len(backend.known_wumpuses())
+            steps += 1
+            engine.step()
+
+    print(f"Episodes: {args.episodes}  Steps: {steps}  Agent: {args.agent}")
+    print(f"{'backend':<10}{'us/step':>10}{'safe/step':>12}{'wumpus/step':>13}")
+    for name in names:
+        print(f"{name:<10}{elapsed[name] / steps * 1e6:>10.1f}"
+              f"{safe_cells[name] / steps:>12.1f}{wumpus_cells[name] / steps:>13.2f}")
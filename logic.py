@@ -1,159 +1,407 @@
 # logic.py
 import random
-from collections import deque
+from bisect import bisect_left, bisect_right
+import numpy as np
 
-# ------------------- Cell Class -------------------
-class Cell:
-    def __init__(self):
-        # Each cell can contain a pit, a wumpus, or gold.
-        self.has_pit = False
-        self.has_wumpus = False
-        self.has_gold = False
+# ------------------- Percept Planes -------------------
+# Percept bit flags stored in WumpusWorld.percept_codes.
+GLITTER = 1
+BREEZE = 2
+STENCH = 4
+
+# One shared, immutable percept tuple per combination of flags, in the
+# same order get_percepts has always reported them.
+PERCEPT_TABLE = tuple(
+    tuple(name for flag, name in ((GLITTER, "glitter"), (BREEZE, "breeze"), (STENCH, "stench"))
+          if code & flag)
+    for code in range(8)
+)
+
+def neighbor_any(plane):
+    """
+    Return a boolean plane that is True wherever at least one of the four
+    orthogonal neighbours is True in `plane`, using shifted-array ORs.
+    """
+    out = np.zeros_like(plane)
+    out[1:, :] |= plane[:-1, :]
+    out[:-1, :] |= plane[1:, :]
+    out[:, 1:] |= plane[:, :-1]
+    out[:, :-1] |= plane[:, 1:]
+    return out
 
 # ------------------- WumpusWorld Class -------------------
 class WumpusWorld:
-    def __init__(self, size=20, pit_prob=0.2):
+    # When True, count_wumpuses/count_pits check the live counters against a
+    # full scan of the planes on every call (for tests and debugging).
+    check_counters = False
+
+    def __init__(self, size=20, pit_prob=0.2, num_wumpuses=15, num_pits=20, wumpus_prob=0.04,
+                 seed=None):
         """
         Create a grid with the following elements:
-        - 15 Wumpuses
-        - 20 pits
-        - 1 gold (placed only in cells without a pit or live wumpus)
+        - num_wumpuses Wumpuses (15 by default)
+        - num_pits pits (20 by default)
+        - 1 gold (placed only in a cell reachable from (0,0) without crossing
+          a pit or live wumpus)
+
+        Passing None for num_pits or num_wumpuses derives the count from
+        pit_prob or wumpus_prob times the number of free cells instead.
         
-        A safe zone is enforced around (0,0), and the board is regenerated 
-        until a safe path from (0,0) to the gold exists.
+        The board is stored as boolean planes indexed [x, y] (pits,
+        wumpuses, gold). Percepts for every cell are computed once the board
+        is final and kept up to date when a wumpus dies or the gold is taken.
+        The number of pits and the positions of the live wumpuses are kept as
+        counters, so count_pits/count_wumpuses are O(1).
+
+        A safe zone is enforced around (0,0), and the board is built winnable
+        in a single pass instead of being regenerated until it is.
+
+        With a seed, the board is drawn from its own random.Random(seed), so
+        the same seed always gives the same board (the same one as calling
+        random.seed(seed) first). Without one, the global `random` is used.
         """
         self.size = size
-        self.grid = [[Cell() for _ in range(size)] for _ in range(size)]
-        attempts = 0
-        # Try generating a board up to 100 times until it's winnable.
-        while attempts < 100:
-            self.place_elements()
-            if self.is_winnable():
-                break
-            attempts += 1
-        if attempts >= 100:
-            raise Exception("Could not generate a winnable board after 100 attempts.")
+        self.rng = random if seed is None else random.Random(seed)
+        free_cells = size * size - len(self.safe_zone_indices())
+        if num_wumpuses is None:
+            num_wumpuses = round(wumpus_prob * free_cells)
+        if num_pits is None:
+            num_pits = round(pit_prob * free_cells)
+        if num_wumpuses + num_pits >= free_cells:
+            raise Exception(f"Cannot fit {num_wumpuses} wumpuses, {num_pits} pits and the gold "
+                            f"on a {size}x{size} board.")
+        self.num_wumpuses = num_wumpuses
+        self.num_pits = num_pits
+        self.pits = np.zeros((size, size), dtype=bool)
+        self.wumpuses = np.zeros((size, size), dtype=bool)
+        self.gold = np.zeros((size, size), dtype=bool)
+        self.place_elements()
+        self.build_percept_cache()
+
+    def safe_zone_indices(self):
+        # Flat (x * size + y) indices of the safe starting zone around (0,0).
+        return sorted({x * self.size + y for x in (0, 1) for y in (0, 1)
+                       if x < self.size and y < self.size})
     
     def place_elements(self):
-        # Reset grid by reinitializing each cell.
-        for x in range(self.size):
-            for y in range(self.size):
-                self.grid[x][y] = Cell()
-        
-        # Define a safe starting zone around (0,0)
-        safe_zone = {(0, 0), (0, 1), (1, 0), (1, 1)}
-        all_positions = [(x, y) for x in range(self.size) for y in range(self.size)]
-        available_positions = [pos for pos in all_positions if pos not in safe_zone]
-        
-        # Place 15 distinct Wumpuses in random positions.
-        wumpus_positions = random.sample(available_positions, 15)
-        for (x, y) in wumpus_positions:
-            self.grid[x][y].has_wumpus = True
-        available_positions = [pos for pos in available_positions if pos not in wumpus_positions]
-        
-        # Place 20 distinct pits.
-        pit_positions = random.sample(available_positions, 20)
-        for (x, y) in pit_positions:
-            self.grid[x][y].has_pit = True
-        available_positions = [pos for pos in available_positions if pos not in pit_positions]
-        
-        # Place gold in one cell that is free of pits and wumpuses.
-        gold_pos = random.choice(available_positions)
-        self.grid[gold_pos[0]][gold_pos[1]].has_gold = True
+        """
+        Place the hazards and the gold in one pass.
+
+        Hazards are sampled directly from the cells outside the safe zone.
+        The gold is then drawn from the cells reachable from (0,0), so the
+        board is winnable by construction and never has to be regenerated.
+        """
+        # Reset the planes in place.
+        self.pits[:] = False
+        self.wumpuses[:] = False
+        self.gold[:] = False
+
+        # Sample distinct hazard cells, skipping over the safe-zone indices.
+        safe = self.safe_zone_indices()
+        hazards = []
+        for idx in self.rng.sample(range(self.size * self.size - len(safe)),
+                                 self.num_wumpuses + self.num_pits):
+            for s in safe:
+                if idx >= s:
+                    idx += 1
+            hazards.append(idx)
+        self.wumpuses.flat[hazards[:self.num_wumpuses]] = True
+        self.pits.flat[hazards[self.num_wumpuses:]] = True
+
+        # Place gold in a reachable cell outside the safe zone.
+        component = self.reachable_cells()
+        safe = set(safe)
+        candidates = [idx for idx in component if idx not in safe]
+        if not candidates:
+            # The safe zone is walled in: move one wall hazard out of the way.
+            self._open_component(component)
+            candidates = [idx for idx in self.reachable_cells() if idx not in safe]
+        self.gold.flat[self.rng.choice(candidates)] = True
+        self.init_counters()
+
+    @classmethod
+    def from_arrays(cls, pits, wumpuses, gold):
+        """
+        Wrap ready-made (size, size) pit, wumpus and gold planes, e.g. one
+        board from generate_boards, as a WumpusWorld. The planes are copied,
+        so the world can be played without touching the source arrays.
+        """
+        world = cls.__new__(cls)
+        world.size = len(pits)
+        world.pits = np.array(pits, dtype=bool)
+        world.wumpuses = np.array(wumpuses, dtype=bool)
+        world.gold = np.array(gold, dtype=bool)
+        world.num_wumpuses = int(np.count_nonzero(world.wumpuses))
+        world.num_pits = int(np.count_nonzero(world.pits))
+        world.init_counters()
+        world.build_percept_cache()
+        return world
+
+    def init_counters(self):
+        # Live counters, maintained by shoot_arrow from here on.
+        self.wumpus_positions = {(int(x), int(y)) for x, y in np.argwhere(self.wumpuses)}
+        self.pit_count = int(np.count_nonzero(self.pits))
+        # 1 for every cell without a pit or live wumpus (see free_map).
+        self.free = bytearray((~(self.pits | self.wumpuses)).tobytes())
+        # Sorted live-wumpus index per row (y -> xs) and per column (x -> ys).
+        self.wumpus_rows = [[] for _ in range(self.size)]
+        self.wumpus_cols = [[] for _ in range(self.size)]
+        for x, y in sorted(self.wumpus_positions):
+            self.wumpus_rows[y].append(x)
+            self.wumpus_cols[x].append(y)
+
+    def _flat_neighbors(self, idx):
+        x, y = divmod(idx, self.size)
+        if x > 0:
+            yield idx - self.size
+        if x < self.size - 1:
+            yield idx + self.size
+        if y > 0:
+            yield idx - 1
+        if y < self.size - 1:
+            yield idx + 1
+
+    def reachable_cells(self):
+        """
+        Return the flat indices of all cells reachable from (0,0) without
+        crossing a pit or live wumpus, in BFS order.
+        """
+        blocked = bytearray((self.pits | self.wumpuses).tobytes())
+        if blocked[0]:
+            return []
+        blocked[0] = 1
+        order = [0]
+        head = 0
+        while head < len(order):
+            for nb in self._flat_neighbors(order[head]):
+                if not blocked[nb]:
+                    blocked[nb] = 1
+                    order.append(nb)
+            head += 1
+        return order
+
+    def _open_component(self, component):
+        # Move a random hazard on the border of `component` to a free cell
+        # outside the enlarged component (or drop it if there is none).
+        inside = set(component)
+        border = sorted({nb for idx in component for nb in self._flat_neighbors(idx)
+                         if nb not in inside})
+        idx = self.rng.choice(border)
+        plane = self.wumpuses if self.wumpuses.flat[idx] else self.pits
+        plane.flat[idx] = False
+        grown = set(self.reachable_cells())
+        blocked = (self.pits | self.wumpuses).ravel()
+        outside = [i for i in range(self.size * self.size)
+                   if i not in grown and not blocked[i]]
+        if outside:
+            plane.flat[self.rng.choice(outside)] = True
+
+    def free_map(self):
+        # bytearray with a 1 for every cell without a pit or live wumpus. The
+        # map is kept up to date by shoot_arrow and shared: do not modify it.
+        return self.free
 
     def is_winnable(self):
-        # Find the position of the gold.
-        gold_pos = None
-        for x in range(self.size):
-            for y in range(self.size):
-                if self.grid[x][y].has_gold:
-                    gold_pos = (x, y)
-                    break
-            if gold_pos is not None:
-                break
-        if not gold_pos:
+        # The board is winnable if the gold is reachable from (0,0).
+        gold_cells = np.flatnonzero(self.gold)
+        if not len(gold_cells):
             return False
-        
-        # Ensure starting cell is safe.
-        if self.grid[0][0].has_pit or self.grid[0][0].has_wumpus:
-            return False
-        
-        # Use BFS to determine if a safe path exists from (0,0) to the gold.
-        visited = set()
-        queue = [(0, 0)]
-        while queue:
-            cx, cy = queue.pop(0)
-            if (cx, cy) == gold_pos:
-                return True
-            for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
-                nx, ny = cx + dx, cy + dy
-                if 0 <= nx < self.size and 0 <= ny < self.size:
-                    if (nx, ny) not in visited:
-                        if not self.grid[nx][ny].has_pit and not self.grid[nx][ny].has_wumpus:
-                            visited.add((nx, ny))
-                            queue.append((nx, ny))
-        return False
+        return int(gold_cells[0]) in set(self.reachable_cells())
+
+    def build_percept_cache(self):
+        """
+        Precompute the percepts of every cell. percept_codes holds the
+        GLITTER/BREEZE/STENCH flags per cell, and _percepts holds the matching
+        shared tuple from PERCEPT_TABLE in flat (x * size + y) order.
+        """
+        codes = (self.gold * GLITTER) | (neighbor_any(self.pits) * BREEZE)
+        codes |= neighbor_any(self.wumpuses) * STENCH
+        self.percept_codes = codes.astype(np.uint8)
+        self._percepts = [PERCEPT_TABLE[c] for c in self.percept_codes.ravel().tolist()]
+
+    def _set_percept_code(self, x, y, code):
+        self.percept_codes[x, y] = code
+        self._percepts[x * self.size + y] = PERCEPT_TABLE[code]
+
+    def _refresh_stench_around(self, x, y):
+        # Only the four neighbours of (x, y) can change their stench.
+        for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.size and 0 <= ny < self.size:
+                code = int(self.percept_codes[nx, ny]) & ~STENCH
+                for ddx, ddy in [(-1,0), (1,0), (0,-1), (0,1)]:
+                    mx, my = nx + ddx, ny + ddy
+                    if 0 <= mx < self.size and 0 <= my < self.size and self.wumpuses[mx, my]:
+                        code |= STENCH
+                        break
+                self._set_percept_code(nx, ny, code)
 
     def get_percepts(self, x, y):
         """
-        Return a list of percepts for the cell (x,y).
+        Return the percepts for the cell (x,y) as a shared, immutable tuple.
         - 'glitter' if the cell has gold.
         - 'breeze' if any neighbor has a pit.
         - 'stench' if any neighbor has a wumpus.
         """
-        percepts = []
-        if self.grid[x][y].has_gold:
-            percepts.append("glitter")
-        directions = [(-1,0), (1,0), (0,-1), (0,1)]
-        # Check for adjacent pits.
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.size and 0 <= ny < self.size:
-                if self.grid[nx][ny].has_pit:
-                    percepts.append("breeze")
-                    break
-        # Check for adjacent wumpuses.
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.size and 0 <= ny < self.size:
-                if self.grid[nx][ny].has_wumpus:
-                    percepts.append("stench")
-                    break
-        return percepts
+        return self._percepts[x * self.size + y]
+
+    def take_gold(self, x, y):
+        """Remove the gold from (x, y). Returns True if there was gold there."""
+        if not self.gold[x, y]:
+            return False
+        self.gold[x, y] = False
+        self._set_percept_code(x, y, int(self.percept_codes[x, y]) & ~GLITTER)
+        return True
 
     def shoot_arrow(self, x, y, orientation):
         """
         Shoot an arrow from (x, y) in the specified orientation.
         If a wumpus is hit, it is removed and the method returns True.
         """
-        dx, dy = 0, 0
-        if orientation == 'N':
-            dx, dy = 0, 1
-        elif orientation == 'S':
-            dx, dy = 0, -1
-        elif orientation == 'E':
-            dx, dy = 1, 0
-        elif orientation == 'W':
-            dx, dy = -1, 0
-        cx, cy = x, y
-        # Move arrow step by step until it leaves the grid.
-        while True:
-            cx += dx
-            cy += dy
-            if not (0 <= cx < self.size and 0 <= cy < self.size):
-                break
-            if self.grid[cx][cy].has_wumpus:
-                self.grid[cx][cy].has_wumpus = False
-                return True, (cx, cy)
-        return False, None
+        target = self.wumpus_on_ray(x, y, orientation)
+        if target is None:
+            return False, None
+        cx, cy = target
+        self.wumpuses[cx, cy] = False
+        self.wumpus_positions.discard(target)
+        self.free[cx * self.size + cy] = 1
+        row = self.wumpus_rows[cy]
+        del row[bisect_left(row, cx)]
+        col = self.wumpus_cols[cx]
+        del col[bisect_left(col, cy)]
+        self._refresh_stench_around(cx, cy)
+        return True, target
+
+    def wumpus_on_ray(self, x, y, orientation):
+        """
+        Return the first live wumpus an arrow shot from (x, y) in the given
+        orientation would hit, or None. One bisect on the row/column index,
+        so the cost does not depend on the board size. Nothing is changed.
+        """
+        if orientation in ('N', 'S'):
+            line, pos = self.wumpus_cols[x], y
+        else:
+            line, pos = self.wumpus_rows[y], x
+        if orientation in ('N', 'E'):
+            i = bisect_right(line, pos)
+            if i == len(line):
+                return None
+        else:
+            i = bisect_left(line, pos) - 1
+            if i < 0:
+                return None
+        if orientation in ('N', 'S'):
+            return (x, line[i])
+        return (line[i], y)
 
     def count_wumpuses(self):
         # Count all remaining wumpuses.
-        return sum(cell.has_wumpus for row in self.grid for cell in row)
+        if self.check_counters:
+            self.validate_counters()
+        return len(self.wumpus_positions)
 
     def count_pits(self):
         # Count all pits.
-        return sum(cell.has_pit for row in self.grid for cell in row)
+        if self.check_counters:
+            self.validate_counters()
+        return self.pit_count
+
+    def validate_counters(self):
+        """Check the live counters against a full scan of the planes."""
+        scanned = {(int(x), int(y)) for x, y in np.argwhere(self.wumpuses)}
+        if scanned != self.wumpus_positions:
+            raise Exception(f"Wumpus positions out of sync: tracked {sorted(self.wumpus_positions)}, "
+                            f"board has {sorted(scanned)}.")
+        rows = {(vx, vy) for vy, xs in enumerate(self.wumpus_rows) for vx in xs}
+        cols = {(vx, vy) for vx, ys in enumerate(self.wumpus_cols) for vy in ys}
+        if rows != scanned or cols != scanned:
+            raise Exception("Row/column wumpus index out of sync with the board.")
+        free = bytearray((~(self.pits | self.wumpuses)).tobytes())
+        if free != self.free:
+            raise Exception("Free map out of sync with the board.")
+        pits = int(np.count_nonzero(self.pits))
+        if pits != self.pit_count:
+            raise Exception(f"Pit counter out of sync: tracked {self.pit_count}, board has {pits}.")
+
+# ------------------- Batched Board Generation -------------------
+def generate_boards(count, size=20, num_wumpuses=15, num_pits=20, seed=None):
+    """
+    Generate `count` winnable boards in one vectorised pass.
+
+    Returns (pits, wumpuses, gold), each a boolean array of shape
+    (count, size, size) indexed [board, x, y]. Hazards are drawn uniformly
+    outside the safe zone around (0,0). A batched flood fill from (0,0)
+    finds the reachable cells, and the gold is drawn from those.
+    Wrap one board with WumpusWorld.from_arrays(pits[i], wumpuses[i], gold[i]).
+
+    Without a seed, the NumPy generator is seeded from `random`, so seeding
+    `random` makes the batch reproducible as well.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    rng = np.random.default_rng(seed)
+    cells = size * size
+    safe = np.zeros((size, size), dtype=bool)
+    safe[:2, :2] = True
+    safe = safe.ravel()
+    hazard_count = num_wumpuses + num_pits
+    if hazard_count >= cells - np.count_nonzero(safe):
+        raise Exception(f"Cannot fit {num_wumpuses} wumpuses, {num_pits} pits and the gold "
+                        f"on a {size}x{size} board.")
+
+    pits = np.zeros((count, size, size), dtype=bool)
+    wumpuses = np.zeros((count, size, size), dtype=bool)
+    gold = np.zeros((count, size, size), dtype=bool)
+    pending = np.arange(count)
+    while len(pending):
+        n = len(pending)
+        # The hazard_count smallest random keys pick the hazard cells; the
+        # rank of the key decides wumpus vs pit.
+        keys = rng.random((n, cells), dtype=np.float32)
+        keys[:, safe] = 2.0
+        chosen = np.argpartition(keys, hazard_count - 1, axis=1)[:, :hazard_count]
+        ranks = np.argsort(np.take_along_axis(keys, chosen, axis=1), axis=1)
+        chosen = np.take_along_axis(chosen, ranks, axis=1)
+        rows = np.arange(n)[:, None]
+        batch_wumpuses = np.zeros((n, cells), dtype=bool)
+        batch_pits = np.zeros((n, cells), dtype=bool)
+        batch_wumpuses[rows, chosen[:, :num_wumpuses]] = True
+        batch_pits[rows, chosen[:, num_wumpuses:]] = True
+        batch_wumpuses = batch_wumpuses.reshape(n, size, size)
+        batch_pits = batch_pits.reshape(n, size, size)
+
+        reach = reachable_planes(~(batch_pits | batch_wumpuses))
+        eligible = reach.reshape(n, cells) & ~safe
+        keys = rng.random((n, cells), dtype=np.float32)
+        keys[~eligible] = -1.0
+        gold_idx = np.argmax(keys, axis=1)
+        ok = eligible[np.arange(n), gold_idx]
+
+        # Boards whose safe zone is walled in have no gold cell; draw them again.
+        done = pending[ok]
+        pits[done] = batch_pits[ok]
+        wumpuses[done] = batch_wumpuses[ok]
+        gold.reshape(count, cells)[done, gold_idx[ok]] = True
+        pending = pending[~ok]
+    return pits, wumpuses, gold
+
+def reachable_planes(free):
+    """
+    Batched flood fill: given free-cell planes of shape (count, size, size),
+    return the planes of cells reachable from (0,0) through free cells.
+    """
+    reach = np.zeros_like(free)
+    reach[:, 0, 0] = free[:, 0, 0]
+    while True:
+        grown = reach.copy()
+        grown[:, 1:, :] |= reach[:, :-1, :]
+        grown[:, :-1, :] |= reach[:, 1:, :]
+        grown[:, :, 1:] |= reach[:, :, :-1]
+        grown[:, :, :-1] |= reach[:, :, 1:]
+        grown &= free
+        if np.array_equal(grown, reach):
+            return reach
+        reach = grown
 
 # ------------------- Agent Class -------------------
 class Agent:
@@ -198,9 +446,17 @@ class Agent:
 
 # ------------------- WumpusGame Class -------------------
 class WumpusGame:
-    def __init__(self, size=20, pit_prob=0.2):
-        # Create the game world and the agent.
-        self.world = WumpusWorld(size, pit_prob)
+    def __init__(self, size=20, pit_prob=0.2, num_wumpuses=15, num_pits=20, world=None,
+                 seed=None):
+        # Create the game world (unless a ready-made one is given) and the agent.
+        # A new board always gets a seed (drawn from `random` if none is
+        # given), kept in self.seed so the episode can be replayed.
+        if world is None:
+            if seed is None:
+                seed = random.getrandbits(64)
+            world = WumpusWorld(size, pit_prob, num_wumpuses, num_pits, seed=seed)
+        self.seed = seed
+        self.world = world
         self.agent = Agent()
         self.game_over = False
         self.win = False
@@ -0,0 +1,235 @@
+# megaworld.py
+import argparse
+import random
+import time
+import numpy as np
+from logic import GLITTER, BREEZE, STENCH, PERCEPT_TABLE
+from engine import WumpusEngine, RISK_LIMIT
+from search import SparseSearch
+
+# Offset of the next cell an arrow reaches, per orientation.
+RAY_STEPS = {'N': (0, 1), 'S': (0, -1), 'E': (1, 0), 'W': (-1, 0)}
+
+# ------------------- ChunkPlane Class -------------------
+class ChunkPlane:
+    """
+    Read-only view of one hazard layer of a ChunkedWorld, indexed like the
+    WumpusWorld planes: plane[x, y] is True if the cell holds the hazard.
+    """
+    def __init__(self, world, layer):
+        self.world = world
+        self.layer = layer
+
+    def __getitem__(self, pos):
+        return self.world.has(self.layer, pos[0], pos[1])
+
+# ------------------- ChunkedWorld Class -------------------
+class ChunkedWorld:
+    """
+    A size x size world that only exists where it has been looked at.
+
+    The board is cut into chunk_size x chunk_size chunks. A chunk's pits
+    and wumpuses are drawn the first time any of its cells is touched, from
+    a generator seeded with (seed, chunk x, chunk y), so the same seed
+    always gives the same world whatever order chunks are visited in. Each
+    cell holds a pit with probability pit_prob, or else a wumpus with
+    probability wumpus_prob. The 2x2 zone at (0,0) and the gold cell,
+    placed within gold_radius of the start, are kept clear. Memory and
+    start-up time depend on the chunks touched, not on size.
+
+    Unlike WumpusWorld, the board is not checked to be winnable, and
+    count_pits/count_wumpuses only count the chunks drawn so far.
+    """
+    def __init__(self, size=100000, pit_prob=0.05, wumpus_prob=0.04, chunk_size=64,
+                 seed=0, gold_radius=32):
+        self.size = size
+        self.pit_prob = pit_prob
+        self.wumpus_prob = wumpus_prob
+        self.chunk_size = chunk_size
+        self.seed = seed
+        # (chunk x, chunk y) -> (pits, wumpuses) boolean planes.
+        self.chunks = {}
+        self.pit_count = 0
+        self.wumpus_count = 0
+
+        radius = min(gold_radius, size)
+        if radius * radius <= 4:
+            raise Exception(f"No room for the gold within {radius} cells of the start")
+        rng = random.Random(seed)
+        self.clear_cells = {(x, y) for x in (0, 1) for y in (0, 1)}
+        while True:
+            self.gold_pos = (rng.randrange(radius), rng.randrange(radius))
+            if self.gold_pos not in self.clear_cells:
+                break
+        self.clear_cells.add(self.gold_pos)
+        self.has_gold = True
+
+        self.pits = ChunkPlane(self, 0)
+        self.wumpuses = ChunkPlane(self, 1)
+
+    def chunk(self, cx, cy):
+        """Return the (pits, wumpuses) planes of a chunk, drawing it on first use."""
+        planes = self.chunks.get((cx, cy))
+        if planes is not None:
+            return planes
+        pits, wumpuses = planes = self.chunks[(cx, cy)] = self.draw_chunk(cx, cy)
+        self.pit_count += int(np.count_nonzero(pits))
+        self.wumpus_count += int(np.count_nonzero(wumpuses))
+        return planes
+
+    def draw_chunk(self, cx, cy):
+        # Draw a chunk's planes from its seed without storing them.
+        c = self.chunk_size
+        rng = np.random.default_rng([self.seed, cx, cy])
+        pits = rng.random((c, c)) < self.pit_prob
+        wumpuses = (rng.random((c, c)) < self.wumpus_prob) & ~pits
+        # Cells past the edge of the board hold nothing.
+        x0, y0 = cx * c, cy * c
+        pits[max(0, self.size - x0):, :] = False
+        pits[:, max(0, self.size - y0):] = False
+        wumpuses[max(0, self.size - x0):, :] = False
+        wumpuses[:, max(0, self.size - y0):] = False
+        for x, y in self.clear_cells:
+            if x0 <= x < x0 + c and y0 <= y < y0 + c:
+                pits[x - x0, y - y0] = False
+                wumpuses[x - x0, y - y0] = False
+        return pits, wumpuses
+
+    def has(self, layer, x, y):
+        c = self.chunk_size
+        return bool(self.chunk(x // c, y // c)[layer][x % c, y % c])
+
+    def get_percepts(self, x, y):
+        """Return the percepts for the cell (x,y) as a shared, immutable tuple."""
+        code = GLITTER if self.has_gold and (x, y) == self.gold_pos else 0
+        for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.size and 0 <= ny < self.size:
+                if self.has(0, nx, ny):
+                    code |= BREEZE
+                if self.has(1, nx, ny):
+                    code |= STENCH
+        return PERCEPT_TABLE[code]
+
+    def take_gold(self, x, y):
+        """Remove the gold from (x, y). Returns True if there was gold there."""
+        if not self.has_gold or (x, y) != self.gold_pos:
+            return False
+        self.has_gold = False
+        return True
+
+    def shoot_arrow(self, x, y, orientation):
+        """
+        Shoot an arrow from (x, y) in the specified orientation.
+        If a wumpus is hit, it is removed and the method returns True.
+        """
+        target = self.wumpus_on_ray(x, y, orientation)
+        if target is None:
+            return False, None
+        c = self.chunk_size
+        tx, ty = target
+        self.chunk(tx // c, ty // c)[1][tx % c, ty % c] = False
+        self.wumpus_count -= 1
+        return True, target
+
+    def wumpus_on_ray(self, x, y, orientation):
+        """
+        First live wumpus along the ray, or None. The ray is scanned one
+        chunk at a time: chunks already drawn are read in place, the others
+        are drawn just for the look and not kept, so a missed shot does not
+        make the world grow out to the board edge.
+        """
+        dx, dy = RAY_STEPS[orientation]
+        c = self.chunk_size
+        x, y = x + dx, y + dy
+        while 0 <= x < self.size and 0 <= y < self.size:
+            cx, cy = x // c, y // c
+            planes = self.chunks.get((cx, cy))
+            if planes is None:
+                planes = self.draw_chunk(cx, cy)
+            wumpuses = planes[1]
+            lx, ly = x - cx * c, y - cy * c
+            # The ray's cells in this chunk, in the order the arrow meets them.
+            if dx > 0:
+                line = wumpuses[lx:, ly]
+            elif dx < 0:
+                line = wumpuses[lx::-1, ly]
+            elif dy > 0:
+                line = wumpuses[lx, ly:]
+            else:
+                line = wumpuses[lx, ly::-1]
+            hits = np.flatnonzero(line)
+            if len(hits):
+                k = int(hits[0])
+                return (x + dx * k, y + dy * k)
+            x, y = x + dx * len(line), y + dy * len(line)
+        return None
+
+    def count_wumpuses(self):
+        # Live wumpuses in the chunks drawn so far.
+        return self.wumpus_count
+
+    def count_pits(self):
+        # Pits in the chunks drawn so far.
+        return self.pit_count
+
+# ------------------- MegaEngine Class -------------------
+class MegaEngine(WumpusEngine):
+    """
+    Headless agent for ChunkedWorld boards.
+
+    Uses the sparse knowledge backend and SparseSearch, so the agent's own
+    memory also grows with the explored area only. The hazard counts of
+    such a board are unknown, so the goal is the gold alone and the
+    densities stand in for the counts when the agent has to guess.
+    """
+    search_class = SparseSearch
+
+    def __init__(self, size=100000, pit_prob=0.05, wumpus_prob=0.04, chunk_size=64,
+                 gold_radius=32, risk_limit=RISK_LIMIT):
+        self.wumpus_prob = wumpus_prob
+        self.chunk_size = chunk_size
+        self.gold_radius = gold_radius
+        WumpusEngine.__init__(self, size, pit_prob, num_wumpuses=None, num_pits=None,
+                              knowledge="sparse", risk_limit=risk_limit)
+
+    def new_game(self, world=None, seed=None):
+        """Start a fresh chunked board (from `seed`, or a random one)."""
+        if world is None:
+            if seed is None:
+                seed = random.getrandbits(64)
+            world = ChunkedWorld(self.size, self.pit_prob, self.wumpus_prob,
+                                 self.chunk_size, seed, self.gold_radius)
+        WumpusEngine.new_game(self, world, seed)
+
+    def is_win(self):
+        return self.game.agent.has_gold
+
+    def hazard_priors(self):
+        return {'pit': self.pit_prob, 'wumpus': self.wumpus_prob}
+
+# ------------------- Main Entry Point -------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run headless episodes on lazily drawn mega boards.")
+    parser.add_argument("episodes", type=int, nargs="?", default=10)
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--gold-radius", type=int, default=32)
+    parser.add_argument("--max-steps", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = MegaEngine(size=args.size, chunk_size=args.chunk_size, gold_radius=args.gold_radius)
+    wins = 0
+    chunks = 0
+    for i in range(args.episodes):
+        engine.new_game(seed=args.seed + i)
+        result = engine.run_episode(max_steps=args.max_steps)
+        wins += result["win"]
+        chunks += len(engine.game.world.chunks)
+    elapsed = time.perf_counter() - start
+    print(f"Episodes: {args.episodes}")
+    print(f"Win Rate: {wins / args.episodes * 100:.2f}%")
+    print(f"Chunks drawn per episode: {chunks / args.episodes:.1f}")
+    print(f"Total Time: {elapsed:.2f}s")
@@ -0,0 +1,147 @@
+# online_stats.py
+import math
+from array import array
+from profiler import PhaseStats
+
+def wilson_interval(successes, trials, z=1.96):
+    """
+    Wilson score interval for a success rate (95% for z=1.96). Returns
+    (low, high) as fractions; (0.0, 1.0) when there are no trials.
+    """
+    if not trials:
+        return 0.0, 1.0
+    p = successes / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+# ------------------- RunningStats Class -------------------
+class RunningStats:
+    """Count, mean, variance, min and max of a stream (Welford's method)."""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def variance(self):
+        # Sample variance.
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def std(self):
+        return math.sqrt(self.variance())
+
+# ------------------- BinnedSeries Class -------------------
+class BinnedSeries:
+    """
+    A per-episode series downsampled to at most max_bins bins of equal
+    width. Each bin keeps the count, sum, min and max of its values. When
+    the bins run out, neighbours are merged in pairs and the width doubles,
+    so memory stays bounded however long the run is.
+    """
+    def __init__(self, max_bins=500):
+        self.max_bins = max(2, max_bins - max_bins % 2)
+        self.width = 1
+        self.counts = array("l")
+        self.sums = array("d")
+        self.mins = array("d")
+        self.maxs = array("d")
+
+    def add(self, value):
+        if not self.counts or self.counts[-1] == self.width:
+            # The last bin is full: start a new one, merging first if needed
+            # (merged bins are all full too).
+            if len(self.counts) == self.max_bins:
+                self.merge()
+            self.counts.append(0)
+            self.sums.append(0.0)
+            self.mins.append(value)
+            self.maxs.append(value)
+        self.counts[-1] += 1
+        self.sums[-1] += value
+        self.mins[-1] = min(self.mins[-1], value)
+        self.maxs[-1] = max(self.maxs[-1], value)
+
+    def merge(self):
+        counts, sums, mins, maxs = array("l"), array("d"), array("d"), array("d")
+        for i in range(0, len(self.counts), 2):
+            counts.append(self.counts[i] + self.counts[i + 1])
+            sums.append(self.sums[i] + self.sums[i + 1])
+            mins.append(min(self.mins[i], self.mins[i + 1]))
+            maxs.append(max(self.maxs[i], self.maxs[i + 1]))
+        self.counts, self.sums, self.mins, self.maxs = counts, sums, mins, maxs
+        self.width *= 2
+
+    def points(self):
+        """
+        Return (centres, means, mins, maxs) lists ready to plot, with each
+        bin's centre as a 1-based episode number.
+        """
+        centres = [i * self.width + (n + 1) / 2 for i, n in enumerate(self.counts)]
+        means = [s / n for s, n in zip(self.sums, self.counts)]
+        return centres, means, list(self.mins), list(self.maxs)
+
+# ------------------- RunSummary Class -------------------
+class RunSummary:
+    """
+    Online aggregate of an episode log: win rate with a confidence
+    interval, running score, step and time statistics, time quantiles (from
+    a log-bucketed histogram, within about 12%) and a binned time series
+    for plotting. Feed it records with add() or update().
+    """
+    def __init__(self, max_bins=500):
+        self.episodes = 0
+        self.wins = 0
+        self.score = RunningStats()
+        self.steps = RunningStats()
+        self.time = RunningStats()
+        self.time_quantiles = PhaseStats()
+        self.time_series = BinnedSeries(max_bins)
+
+    def add(self, episode):
+        self.episodes += 1
+        self.wins += episode.win
+        self.score.add(episode.score)
+        self.steps.add(episode.steps)
+        self.time.add(episode.time)
+        self.time_quantiles.add(episode.time)
+        self.time_series.add(episode.time)
+
+    def update(self, episodes):
+        """Add every record from an iterable; returns how many were added."""
+        start = self.episodes
+        for episode in episodes:
+            self.add(episode)
+        return self.episodes - start
+
+    def win_rate(self):
+        return self.wins / self.episodes if self.episodes else 0.0
+
+    def report(self):
+        """Text summary of the statistics so far."""
+        if not self.episodes:
+            return "Episodes: 0"
+        low, high = wilson_interval(self.wins, self.episodes)
+        q = self.time_quantiles.percentile
+        return "\n".join([
+            f"Episodes: {self.episodes}",
+            f"Win Rate: {self.win_rate() * 100:.2f}% (95% CI {low * 100:.2f}% - {high * 100:.2f}%)",
+            f"Score: mean {self.score.mean:.2f}, std {self.score.std():.2f}, "
+            f"min {self.score.min:.0f}, max {self.score.max:.0f}",
+            f"Steps: mean {self.steps.mean:.1f}, std {self.steps.std():.1f}, max {self.steps.max:.0f}",
+            f"Time: mean {self.time.mean * 1e3:.2f}ms, std {self.time.std() * 1e3:.2f}ms, "
+            f"p50 {q(0.5) * 1e3:.2f}ms, p95 {q(0.95) * 1e3:.2f}ms, p99 {q(0.99) * 1e3:.2f}ms",
+            f"Total Time: {self.time.mean * self.episodes:.2f}s",
+        ])
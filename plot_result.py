@@ -1,58 +1,119 @@
-import pickle
-import matplotlib.pyplot as plt
+import argparse
+import glob
+import os
+import time
+import matplotlib
+from episode_log import EpisodeLogReader
+from online_stats import RunSummary, wilson_interval
 
-# Load the saved iteration results from the pickle file
-with open("iteration_results.pkl", "rb") as f:
-    results = pickle.load(f)
+BAR_FILE = "iteration_results_bar.png"
+TIMES_FILE = "iteration_times_scatter.png"
+
+def newest_log():
+    logs = glob.glob(os.path.join("Results", "Logs", "*.wlog"))
+    if not logs:
+        raise Exception("No episode log found in Results/Logs")
+    return max(logs, key=os.path.getmtime)
 
 # ----- Bar Chart: Wins vs Losses -----
-wins = sum(1 for outcome in results["outcomes"] if "win" in outcome.lower())
-losses = results["iterations"] - wins
-
-fig, ax = plt.subplots(figsize=(12, 8), dpi=300)
-bars = ax.bar(["Wins", "Losses"], [wins, losses], color=["green", "red"], edgecolor="black", width=0.5)
-
-# Annotate bars with counts
-for bar in bars:
-    height = bar.get_height()
-    ax.annotate(f'{int(height)}',
-                xy=(bar.get_x() + bar.get_width() / 2, height),
-                xytext=(0, 3),  # 3 points vertical offset
-                textcoords="offset points",
-                ha='center', va='bottom', fontsize=14)
-
-ax.set_title(f"Win vs Loss Count over {results['iterations']} Iterations", fontsize=18)
-ax.set_xlabel("Outcome", fontsize=16)
-ax.set_ylabel("Count", fontsize=16)
-ax.legend(bars, ["Wins", "Losses"], fontsize=14, loc="upper right")
-plt.tight_layout()
-plt.savefig("iteration_results_bar.png", dpi=300)
-plt.show()
+def plot_outcomes(summary, plt):
+    wins = summary.wins
+    losses = summary.episodes - wins
+    low, high = wilson_interval(wins, summary.episodes)
+
+    fig, ax = plt.subplots(figsize=(12, 8), dpi=300)
+    bars = ax.bar(["Wins", "Losses"], [wins, losses], color=["green", "red"], edgecolor="black", width=0.5)
+    # 95% interval of each count, from the interval of the win rate
+    n = summary.episodes
+    ax.errorbar([0, 1], [wins, losses],
+                yerr=[[wins - low * n, losses - (1 - high) * n], [high * n - wins, (1 - low) * n - losses]],
+                fmt="none", ecolor="black", capsize=8)
+
+    # Annotate bars with counts
+    for bar in bars:
+        height = bar.get_height()
+        ax.annotate(f'{int(height)}',
+                    xy=(bar.get_x() + bar.get_width() / 2, height),
+                    xytext=(0, 3),  # 3 points vertical offset
+                    textcoords="offset points",
+                    ha='center', va='bottom', fontsize=14)
+
+    ax.set_title(f"Win vs Loss Count over {n} Iterations\n"
+                 f"Win Rate: {summary.win_rate() * 100:.2f}% (95% CI {low * 100:.2f}% - {high * 100:.2f}%)",
+                 fontsize=18)
+    ax.set_xlabel("Outcome", fontsize=16)
+    ax.set_ylabel("Count", fontsize=16)
+    ax.legend(bars, ["Wins", "Losses"], fontsize=14, loc="upper right")
+    fig.tight_layout()
+    fig.savefig(BAR_FILE, dpi=300)
+    return fig
 
 # ----- Scatter Plot: Iteration Times -----
-if "iteration_times" in results:
+def plot_times(summary, plt):
+    series = summary.time_series
+    centres, means, mins, maxs = series.points()
     # Convert each iteration time from seconds to minutes
-    iteration_times_minutes = [t / 60 for t in results["iteration_times"]]
-    total_time_minutes = sum(results["iteration_times"]) / 60
-    iterations = list(range(1, len(iteration_times_minutes) + 1))
+    means = [t / 60 for t in means]
+    total_time_minutes = summary.time.mean * summary.episodes / 60
 
     fig, ax = plt.subplots(figsize=(12, 8), dpi=300)
-    scatter = ax.scatter(iterations, iteration_times_minutes, color="blue", s=60, label="Iteration Time (min)")
-    ax.plot(iterations, iteration_times_minutes, linestyle="--", color="blue", alpha=0.7)
+    if series.width == 1:
+        ax.scatter(centres, means, color="blue", s=60, label="Iteration Time (min)")
+        ax.plot(centres, means, linestyle="--", color="blue", alpha=0.7)
+    else:
+        # Too many iterations to show one by one: plot each bin's mean and range
+        ax.fill_between(centres, [t / 60 for t in mins], [t / 60 for t in maxs],
+                        color="blue", alpha=0.2, label="Min - Max per Bin")
+        ax.plot(centres, means, color="blue", label=f"Mean per {series.width} Iterations (min)")
 
-    ax.set_title(f"Iteration Time per Iteration over {results['iterations']} Iterations\nTotal Time: {total_time_minutes:.2f} minutes", fontsize=18)
+    ax.set_title(f"Iteration Time per Iteration over {summary.episodes} Iterations\nTotal Time: {total_time_minutes:.2f} minutes", fontsize=18)
     ax.set_xlabel("Iteration Number", fontsize=16)
     ax.set_ylabel("Time (minutes)", fontsize=16)
     ax.legend(fontsize=14, loc="upper right")
-    
-    # Optionally, annotate the first and last point for clarity
-    ax.annotate(f"{iteration_times_minutes[0]:.2f} min", xy=(iterations[0], iteration_times_minutes[0]),
-                xytext=(5, 5), textcoords="offset points", fontsize=12)
-    ax.annotate(f"{iteration_times_minutes[-1]:.2f} min", xy=(iterations[-1], iteration_times_minutes[-1]),
-                xytext=(-40, 5), textcoords="offset points", fontsize=12)
-
-    plt.tight_layout()
-    plt.savefig("iteration_times_scatter.png", dpi=300)
-    plt.show()
-else:
-    print("No iteration_times data found in the pickle file.")
+    fig.tight_layout()
+    fig.savefig(TIMES_FILE, dpi=300)
+    return fig
+
+# ------------------- Main Entry Point -------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Summarise and plot an episode log.")
+    parser.add_argument("log", nargs="?", default=None,
+                        help="episode log to read (default: the newest one in Results/Logs)")
+    parser.add_argument("--bins", type=int, default=500,
+                        help="most points drawn in the time chart (default: %(default)s)")
+    parser.add_argument("--follow", action="store_true",
+                        help="keep reading a log that is still being written, updating the "
+                             "summary and charts as episodes arrive (Ctrl-C to stop)")
+    parser.add_argument("--interval", type=float, default=5.0,
+                        help="seconds between reads in --follow mode (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.follow:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    log_path = args.log or newest_log()
+    reader = EpisodeLogReader(log_path)
+    summary = RunSummary(max_bins=args.bins)
+
+    if not args.follow:
+        # One pass over the log; only the aggregates are kept.
+        summary.update(reader.episodes())
+        if not summary.episodes:
+            raise Exception(f"{log_path} holds no episodes")
+        print(summary.report())
+        plot_outcomes(summary, plt)
+        plot_times(summary, plt)
+        plt.show()
+    else:
+        print(f"Following {log_path}", flush=True)
+        try:
+            while True:
+                # Only the records appended since the last read are parsed.
+                if summary.update(reader.episodes()):
+                    print(summary.report() + "\n", flush=True)
+                    plt.close(plot_outcomes(summary, plt))
+                    plt.close(plot_times(summary, plt))
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            pass
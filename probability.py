@@ -0,0 +1,191 @@
+# probability.py
+import numpy as np
+
+# (hazard, percept) pairs the frontier model is built for.
+HAZARDS = (('pit', 'breeze'), ('wumpus', 'stench'))
+
+# ------------------- FrontierInference Class -------------------
+class FrontierInference:
+    """
+    Pit and wumpus probabilities for the frontier: the unvisited cells next
+    to a visited cell that the knowledge backend has not ruled out.
+
+    Each hazard is modelled on its own, with every unknown cell holding it
+    independently with the prior density passed to risks(). Every visited
+    cell that senses the hazard, and has no neighbour already known to hold
+    it, adds an "at least one of my unknown neighbours" constraint. The
+    frontier is split into components of cells linked by shared constraints,
+    and components are independent of each other.
+
+    For a component of at most exact_limit cells, every assignment is
+    enumerated once to count the satisfying ones by number of hazards, in
+    total and per cell. These count tables do not depend on the prior, so
+    they are memoised by the component's constraints. Components away from
+    the agent's latest observations keep the same constraints from step to
+    step, so they are computed only once. Larger components use a per
+    constraint estimate instead.
+    """
+    def __init__(self, size, exact_limit=16, cache_limit=4096):
+        self.size = size
+        self.exact_limit = exact_limit
+        self.cache_limit = cache_limit
+        # Component constraints -> (cells, totals, per-cell counts).
+        self.cache = {}
+        self.reset()
+
+    def reset(self):
+        # Start a new game; the count tables stay valid and are kept.
+        self.visited = set()
+        self.frontier = set()
+
+    def get_neighbors(self, pos):
+        x, y = pos
+        nbrs = []
+        for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
+            nx, ny = x+dx, y+dy
+            if 0 <= nx < self.size and 0 <= ny < self.size:
+                nbrs.append((nx, ny))
+        return nbrs
+
+    def visit(self, cell):
+        """Move `cell` from the frontier to the visited region."""
+        if cell in self.visited:
+            return
+        self.visited.add(cell)
+        self.frontier.discard(cell)
+        for n in self.get_neighbors(cell):
+            if n not in self.visited:
+                self.frontier.add(n)
+
+    def risks(self, knowledge, percepts, priors):
+        """
+        Return {cell: probability that entering it is fatal} for every
+        frontier cell that is not known to be safe. `knowledge` is the
+        agent's backend, `percepts` maps visited cells to their percepts and
+        `priors` maps each hazard to its density among the unknown cells.
+        """
+        safe = [c for c in self.frontier
+                if knowledge.value(c, 'pit') == 0 and knowledge.value(c, 'wumpus') == 0]
+        # Safety never goes away, so safe cells leave the frontier for good.
+        self.frontier.difference_update(safe)
+        if not self.frontier:
+            return {}
+
+        survive = dict.fromkeys(self.frontier, 1.0)
+        for hazard, percept in HAZARDS:
+            for cell, p in self.hazard_probabilities(knowledge, percepts, hazard,
+                                                     percept, priors[hazard]).items():
+                survive[cell] *= 1.0 - p
+        return {cell: 1.0 - s for cell, s in survive.items()}
+
+    def hazard_probabilities(self, knowledge, percepts, hazard, percept, prior):
+        """Probability of `hazard` in each frontier cell."""
+        probs = {}
+        unknown = set()
+        for cell in self.frontier:
+            v = knowledge.value(cell, hazard)
+            if v == 0.5:
+                unknown.add(cell)
+            else:
+                probs[cell] = float(v)
+        if prior <= 0:
+            probs.update(dict.fromkeys(unknown, 0.0))
+            return probs
+        prior = min(prior, 1.0)
+
+        # One constraint per sensing cell that is not yet explained.
+        constraints = set()
+        for cell in unknown:
+            for v in self.get_neighbors(cell):
+                if v not in self.visited or percept not in percepts.get(v, ()):
+                    continue
+                nbrs = self.get_neighbors(v)
+                if any(knowledge.value(n, hazard) == 1 for n in nbrs):
+                    continue
+                constraints.add(tuple(n[0] * self.size + n[1] for n in nbrs if n in unknown))
+
+        for cell in unknown:
+            probs[cell] = prior
+        for component in self.components(constraints):
+            probs.update(self.component_probabilities(component, prior))
+        return probs
+
+    def components(self, constraints):
+        """Group constraints that share a cell (union-find over cells)."""
+        parent = {}
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for con in constraints:
+            for i in con:
+                parent.setdefault(i, i)
+            root = find(con[0])
+            for i in con[1:]:
+                other = find(i)
+                if other != root:
+                    parent[other] = root
+        groups = {}
+        for con in constraints:
+            groups.setdefault(find(con[0]), []).append(con)
+        return [tuple(sorted(group)) for group in groups.values()]
+
+    def component_probabilities(self, component, prior):
+        cells = sorted({i for con in component for i in con})
+        if len(cells) > self.exact_limit:
+            return self.estimate(component, prior)
+        entry = self.cache.get(component)
+        if entry is None:
+            if len(self.cache) >= self.cache_limit:
+                self.cache.clear()
+            entry = self.count_assignments(component, cells)
+            self.cache[component] = entry
+        cells, totals, per_cell = entry
+
+        n = len(cells)
+        k = np.arange(n + 1)
+        weights = prior ** k * (1.0 - prior) ** (n - k)
+        z = totals @ weights
+        if z <= 0:
+            return self.estimate(component, prior)
+        probs = per_cell @ weights / z
+        return {divmod(idx, self.size): float(p) for idx, p in zip(cells, probs)}
+
+    def count_assignments(self, component, cells):
+        """
+        Enumerate the hazard assignments of `cells` that satisfy every
+        constraint. Returns the cells, the number of satisfying assignments
+        with k hazards (totals[k]) and, per cell, those in which it holds
+        one (per_cell[i, k]).
+        """
+        n = len(cells)
+        local = {idx: i for i, idx in enumerate(cells)}
+        assignments = np.arange(1 << n, dtype=np.int64)
+        ok = np.ones(1 << n, dtype=bool)
+        for con in component:
+            mask = 0
+            for idx in con:
+                mask |= 1 << local[idx]
+            ok &= (assignments & mask) != 0
+        assignments = assignments[ok]
+        bits = (assignments[:, None] >> np.arange(n)) & 1
+        counts = bits.sum(axis=1)
+        totals = np.bincount(counts, minlength=n + 1)
+        per_cell = np.zeros((n, n + 1), dtype=np.int64)
+        for i in range(n):
+            per_cell[i] = np.bincount(counts[bits[:, i] == 1], minlength=n + 1)
+        return cells, totals, per_cell
+
+    def estimate(self, component, prior):
+        # Each constraint alone: P(cell | one of its k cells holds it).
+        probs = {}
+        for con in component:
+            p = prior / (1.0 - (1.0 - prior) ** len(con))
+            for idx in con:
+                cell = divmod(idx, self.size)
+                if p > probs.get(cell, 0.0):
+                    probs[cell] = p
+        return probs
@@ -0,0 +1,147 @@
+# profiler.py
+import json
+import math
+import os
+import time
+
+# Phases timed by default; the GUI-only ones are skipped on a headless engine.
+PHASES = ("update_knowledge", "choose_next_move", "execute_action",
+          "record_percepts", "draw_grid", "update_visited_display")
+
+# Latency histogram resolution: buckets per factor of 10, starting at 100 ns.
+BUCKETS_PER_DECADE = 20
+MIN_LATENCY = 1e-7
+
+def bucket_of(seconds):
+    if seconds <= MIN_LATENCY:
+        return 0
+    return int(math.log10(seconds / MIN_LATENCY) * BUCKETS_PER_DECADE) + 1
+
+def bucket_upper(bucket):
+    # Upper edge of a bucket in seconds.
+    return MIN_LATENCY * 10 ** (bucket / BUCKETS_PER_DECADE)
+
+# ------------------- PhaseStats Class -------------------
+class PhaseStats:
+    """Call count, total time and a log-bucketed latency histogram for one phase."""
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        b = bucket_of(seconds)
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+
+    def percentile(self, q):
+        """
+        Latency below which a fraction `q` of the calls fall, as the upper
+        edge of its histogram bucket (within about 12%).
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen >= rank:
+                return bucket_upper(b)
+        return bucket_upper(max(self.buckets))
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "histogram": [[bucket_upper(b), n] for b, n in sorted(self.buckets.items())],
+        }
+
+# ------------------- PhaseProfiler Class -------------------
+class PhaseProfiler:
+    """
+    Opt-in timing of the agent's hot path.
+
+    attach(engine) replaces the engine's phase methods with timed wrappers
+    set on the instance, and detach(engine) removes them again, so an
+    engine that is not being profiled runs its plain methods with no extra
+    cost. Phases can nest (e.g. draw_grid inside execute_action when the
+    GUI redraws every action), and each phase's times include the phases
+    it calls.
+
+    end_episode(engine) records the episode's steps, BFS expansions,
+    score and outcome. to_dict/save export everything as JSON.
+    """
+    def __init__(self, phases=PHASES):
+        self.phases = phases
+        self.stats = {}
+        self.episodes = []
+        self.expanded_mark = 0
+
+    def attach(self, engine):
+        for name in self.phases:
+            method = getattr(engine, name, None)
+            if method is None:
+                continue
+            stats = self.stats.setdefault(name, PhaseStats())
+            setattr(engine, name, self.timed(method, stats))
+        self.expanded_mark = engine.search.expanded
+        engine.profiler = self
+
+    def detach(self, engine):
+        for name in self.phases:
+            if name in vars(engine):
+                delattr(engine, name)
+        engine.profiler = None
+
+    def timed(self, method, stats):
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stats.add(clock() - start)
+        return wrapper
+
+    def end_episode(self, engine, elapsed=None):
+        expanded = engine.search.expanded
+        self.episodes.append({
+            "steps": engine.steps,
+            "expanded": expanded - self.expanded_mark,
+            "score": engine.score,
+            "win": bool(engine.is_win()),
+            "time": elapsed,
+        })
+        self.expanded_mark = expanded
+
+    def to_dict(self):
+        return {
+            "phases": {name: stats.to_dict() for name, stats in self.stats.items()},
+            "episodes": self.episodes,
+        }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def summary(self):
+        """Text table of the phases, slowest in total first."""
+        lines = [f"{'phase':<24}{'count':>9}{'total s':>10}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}"]
+        for name, stats in sorted(self.stats.items(), key=lambda item: -item[1].total):
+            lines.append(f"{name:<24}{stats.count:>9}{stats.total:>10.3f}"
+                         f"{stats.percentile(0.5) * 1e6:>10.1f}{stats.percentile(0.95) * 1e6:>10.1f}"
+                         f"{stats.percentile(0.99) * 1e6:>10.1f}")
+        if self.episodes:
+            steps = sum(e["steps"] for e in self.episodes)
+            expanded = sum(e["expanded"] for e in self.episodes)
+            lines.append(f"episodes {len(self.episodes)}, steps/episode "
+                         f"{steps / len(self.episodes):.1f}, BFS expansions/episode "
+                         f"{expanded / len(self.episodes):.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,119 @@
+# replay.py
+import argparse
+import heapq
+import sys
+import time
+from logic import WumpusGame
+from engine import WumpusEngine
+from action_log import decode_action, read_action_log
+
+# ------------------- ReplayEngine Class -------------------
+class ReplayEngine(WumpusEngine):
+    """
+    Re-runs logged episodes from their seed and action bytes.
+
+    The board is rebuilt from the seed and every action goes through the
+    engine's own execute_action, so scoring is exactly that of the original
+    run. The agent's knowledge, inference and path search are skipped, which
+    makes a replay much faster than playing the episode again.
+    """
+    def __init__(self, settings):
+        size, num_wumpuses, num_pits, pit_prob = settings
+        WumpusEngine.__init__(self, size, pit_prob, num_wumpuses, num_pits)
+
+    def new_game(self, world=None, seed=None):
+        # Only the state the actions touch; no knowledge base or planner.
+        self.game = WumpusGame(self.size, self.pit_prob, self.num_wumpuses, self.num_pits,
+                               world=world, seed=seed)
+        self.score = 0
+        self.steps = 0
+        self.arrows_at_start = self.game.agent.arrows
+        self.actions = bytearray()
+        self.visited_percepts = {}
+
+    def replay(self, seed, actions):
+        """Play `actions` on the board of `seed`; returns a run_episode style dict."""
+        self.new_game(seed=seed)
+        start = time.perf_counter()
+        for byte in actions:
+            if self.game.game_over:
+                break
+            decision, param = decode_action(byte, self.game.agent)
+            self.actions.append(byte)
+            if decision == "wait":
+                self.game.game_over = True
+                break
+            self.execute_action(decision, param)
+            self.steps += 1
+        return {
+            "score": self.score,
+            "win": self.is_win(),
+            "steps": self.steps,
+            "arrows_used": self.arrows_used(),
+            "time": time.perf_counter() - start,
+        }
+
+def matches(record, result):
+    """True if a replay reproduced the logged score and outcome."""
+    return result["score"] == record.score and bool(result["win"]) == bool(record.win)
+
+# ------------------- Main Entry Point -------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Replay the episodes of an action log and check their scores and outcomes.")
+    parser.add_argument("log", help="action log written by batch.py --actions")
+    parser.add_argument("--seed", type=int, nargs="+", default=None,
+                        help="replay only the episodes with these seeds")
+    parser.add_argument("--longest", type=int, default=None, metavar="N",
+                        help="replay only the N episodes with the most actions")
+    parser.add_argument("--profile", metavar="PATH", default=None,
+                        help="also play the selected episodes again with the full agent, "
+                             "check it takes the logged actions, and write its phase "
+                             "profile as JSON")
+    args = parser.parse_args()
+
+    settings, records = read_action_log(args.log)
+    if args.seed is not None:
+        wanted = set(args.seed)
+        records = (r for r in records if r.seed in wanted)
+    if args.longest is not None:
+        records = heapq.nlargest(args.longest, records, key=lambda r: len(r.actions))
+
+    engine = ReplayEngine(settings)
+    selected = []
+    mismatches = 0
+    episodes = 0
+    actions = 0
+    start = time.perf_counter()
+    for record in records:
+        result = engine.replay(record.seed, record.actions)
+        episodes += 1
+        actions += len(record.actions)
+        if not matches(record, result):
+            mismatches += 1
+            print(f"Mismatch for seed {record.seed}: logged score {record.score} "
+                  f"win {bool(record.win)}, replayed score {result['score']} win {result['win']}")
+        if args.profile:
+            selected.append(record)
+        elif args.seed is not None or args.longest is not None:
+            print(f"seed {record.seed}: {len(record.actions)} actions, score {result['score']}, "
+                  f"{'win' if result['win'] else 'loss'}")
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {episodes} episodes ({actions} actions) in {elapsed:.2f}s, "
+          f"{mismatches} mismatch(es)")
+
+    if args.profile:
+        from profiler import PhaseProfiler
+        size, num_wumpuses, num_pits, pit_prob = settings
+        agent = WumpusEngine(size, pit_prob, num_wumpuses, num_pits)
+        profiler = PhaseProfiler()
+        profiler.attach(agent)
+        for record in selected:
+            agent.new_game(seed=record.seed)
+            agent.run_episode()
+            if bytes(agent.actions) != record.actions:
+                mismatches += 1
+                print(f"The agent took different actions on seed {record.seed}")
+        profiler.save(args.profile)
+        print(profiler.summary())
+    sys.exit(1 if mismatches else 0)
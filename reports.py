@@ -0,0 +1,155 @@
+# reports.py
+import json
+import os
+import pickle
+import queue
+import multiprocessing
+from episode_log import read_episodes
+from online_stats import RunSummary
+
+GRAPHS_DIR = os.path.join("Results", "Graphs")
+TIMING_DIR = os.path.join("Results", "Timing")
+PROFILE_FILE = os.path.join("Results", "Profiles", "iteration_profile.json")
+RESULTS_FILE = "iteration_results.pkl"
+# Most points drawn in the timing chart; longer runs are binned.
+MAX_BINS = 500
+
+def write_report(results, progress=None, base_dir="."):
+    """
+    Render the iteration charts for `results`, whose "log" entry is the
+    path of the run's episode log, and pickle the summary next to them. The
+    log is streamed into a RunSummary, so memory does not depend on the
+    number of episodes, and the timing chart shows at most MAX_BINS bins.
+    A "profile" entry (from
+    PhaseProfiler.to_dict) is written to its own JSON file instead.
+    `progress(text)` is called before each stage. Returns the paths of the
+    files written.
+    """
+    # Imported here so that only the process drawing the charts pays for
+    # matplotlib, and it never needs a display.
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    if progress is None:
+        progress = lambda text: None
+    iterations_run = results["iterations"]
+    progress("Reading episode log...")
+    summary = RunSummary(max_bins=MAX_BINS)
+    summary.update(read_episodes(results["log"]))
+    graphs_dir = os.path.join(base_dir, GRAPHS_DIR)
+    timing_dir = os.path.join(base_dir, TIMING_DIR)
+    os.makedirs(graphs_dir, exist_ok=True)
+    os.makedirs(timing_dir, exist_ok=True)
+    outcome_path = os.path.join(graphs_dir, "iteration_result.png")
+    times_path = os.path.join(timing_dir, "iteration_times.png")
+    results_path = os.path.join(base_dir, RESULTS_FILE)
+
+    # Bar chart
+    progress("Drawing outcome chart...")
+    outcomes = ["Wins", "Losses"]
+    counts = [summary.wins, summary.episodes - summary.wins]
+    plt.figure(figsize=(6, 4), dpi=300)
+    bars = plt.bar(outcomes, counts, color=["green", "red"])
+    plt.title(f"Iteration Outcomes ({iterations_run} Iterations)", fontsize=18)
+    plt.xlabel("Outcome", fontsize=16)
+    plt.ylabel("Count", fontsize=16)
+    plt.ylim(0, max(counts) + 1)
+    for bar, cnt in zip(bars, counts):
+        plt.text(bar.get_x() + bar.get_width()/2, bar.get_height(), f'{cnt}',
+                 ha='center', va='bottom', fontsize=14)
+    plt.tight_layout()
+    plt.savefig(outcome_path, dpi=300)
+    plt.close()
+
+    # Scatter plot for iteration times (bin means and ranges for long runs)
+    progress("Drawing timing chart...")
+    series = summary.time_series
+    centres, means, mins, maxs = series.points()
+    plt.figure(figsize=(6, 4), dpi=300)
+    if series.width == 1:
+        plt.scatter(centres, means, color="blue")
+        plt.plot(centres, means, linestyle="--", color="blue")
+    else:
+        plt.fill_between(centres, mins, maxs, color="blue", alpha=0.2)
+        plt.plot(centres, means, color="blue")
+    plt.title(f"Iteration Time per Iteration ({iterations_run} Iterations)",
+              fontsize=18)
+    plt.xlabel("Iteration Number", fontsize=16)
+    plt.ylabel("Time (seconds)", fontsize=16)
+    plt.tight_layout()
+    plt.savefig(times_path, dpi=300)
+    plt.close()
+
+    paths = [outcome_path, times_path, results_path]
+    profile = results.pop("profile", None)
+    if profile is not None:
+        progress("Saving profile...")
+        profile_path = os.path.join(base_dir, PROFILE_FILE)
+        os.makedirs(os.path.dirname(profile_path), exist_ok=True)
+        with open(profile_path, "w") as f:
+            json.dump(profile, f, indent=2)
+        paths.append(profile_path)
+
+    progress("Saving results...")
+    with open(results_path, "wb") as f:
+        pickle.dump(results, f)
+    return paths
+
+def _report_worker(jobs, events):
+    # Runs in the worker process: write one report per job until told to stop.
+    while True:
+        results = jobs.get()
+        if results is None:
+            break
+        try:
+            paths = write_report(results,
+                                 progress=lambda text: events.put(("progress", text)))
+            events.put(("done", paths))
+        except Exception as exc:
+            events.put(("error", str(exc)))
+
+# ------------------- ReportWorker Class -------------------
+class ReportWorker:
+    """
+    Writes iteration reports in a separate process so the caller (the Tk
+    main loop) never waits on matplotlib or the disk. Jobs go in through
+    one queue; progress comes back through another as (kind, payload)
+    events, where kind is "progress", "done" or "error".
+    """
+    def __init__(self):
+        self.process = None
+        self.jobs = None
+        self.events = None
+
+    def start(self):
+        self.jobs = multiprocessing.Queue()
+        self.events = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=_report_worker,
+                                               args=(self.jobs, self.events),
+                                               daemon=True)
+        self.process.start()
+
+    def submit(self, results):
+        """Queue a report for `results`; the worker is started on first use."""
+        if self.process is None or not self.process.is_alive():
+            self.start()
+        self.jobs.put(results)
+
+    def poll(self):
+        """Return the events received since the last call, without blocking."""
+        events = []
+        if self.events is None:
+            return events
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self):
+        """Let the worker finish its queued reports, then stop it."""
+        if self.process is not None and self.process.is_alive():
+            self.jobs.put(None)
+            self.process.join()
+        self.process = None
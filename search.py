@@ -0,0 +1,214 @@
+# search.py
+
+def flat_neighbors(idx, size):
+    # Flat indices of the in-bounds neighbours of idx, in (-x, +x, -y, +y) order.
+    x, y = divmod(idx, size)
+    nbrs = []
+    if x > 0:
+        nbrs.append(idx - size)
+    if x < size - 1:
+        nbrs.append(idx + size)
+    if y > 0:
+        nbrs.append(idx - 1)
+    if y < size - 1:
+        nbrs.append(idx + 1)
+    return tuple(nbrs)
+
+# ------------------- GridSearch Class -------------------
+class GridSearch:
+    """
+    Breadth-first search over a size x size grid on flat cell indices
+    (x * size + y).
+
+    The neighbour table and the queue, parent and visit-stamp arrays are
+    allocated once and reused by every search; a new stamp marks a fresh
+    search instead of clearing them. Neighbours are expanded in the agent's
+    usual order (-x, +x, -y, +y), so the first goal found and the path to it
+    are the same as with a list-of-paths BFS. After a search, the route to
+    the goal is read back from the parent pointers with first_step or path.
+    """
+    def __init__(self, size):
+        self.size = size
+        n = size * size
+        self.neighbors = [flat_neighbors(idx, size) for idx in range(n)]
+        self.parent = [-1] * n
+        self.seen = [0] * n
+        self.queue = [0] * n
+        self.stamp = 0
+        # Total cells expanded over the lifetime of this kernel.
+        self.expanded = 0
+
+    def bfs(self, sources, goals, passable):
+        """
+        Search from every index in `sources` at once through cells with
+        passable[idx] set, and return the first index in `goals` reached
+        (or -1 if none is reachable). Sources are not checked against
+        `passable`; a source that is itself a goal is returned at once.
+        """
+        neighbors = self.neighbors
+        parent = self.parent
+        seen = self.seen
+        queue = self.queue
+        self.stamp += 1
+        stamp = self.stamp
+
+        tail = 0
+        for src in sources:
+            if seen[src] == stamp:
+                continue
+            if src in goals:
+                parent[src] = -1
+                return src
+            seen[src] = stamp
+            parent[src] = -1
+            queue[tail] = src
+            tail += 1
+
+        head = 0
+        while head < tail:
+            idx = queue[head]
+            head += 1
+            for nb in neighbors[idx]:
+                if seen[nb] == stamp or not passable[nb]:
+                    continue
+                seen[nb] = stamp
+                parent[nb] = idx
+                if nb in goals:
+                    self.expanded += head
+                    return nb
+                queue[tail] = nb
+                tail += 1
+        self.expanded += head
+        return -1
+
+    def first_step(self, goal):
+        """
+        Return the cell right after the source on the path to `goal` found
+        by the last search (the goal itself if it is one step away or is a
+        source).
+        """
+        parent = self.parent
+        step = goal
+        prev = parent[goal]
+        while prev >= 0 and parent[prev] >= 0:
+            step = prev
+            prev = parent[prev]
+        return step
+
+    def path(self, goal):
+        """Reconstruct the full source-to-goal path found by the last search."""
+        path = [goal]
+        prev = self.parent[goal]
+        while prev >= 0:
+            path.append(prev)
+            prev = self.parent[prev]
+        path.reverse()
+        return path
+
+# ------------------- SparseSearch Class -------------------
+class SparseSearch(GridSearch):
+    """
+    The same search for boards too large to allocate per-cell arrays for.
+    Parent pointers live in a dict that only holds the cells the last
+    search reached, and neighbours are computed on the fly, so memory
+    follows the searched area rather than size * size.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.parent = {}
+        self.expanded = 0
+
+    def bfs(self, sources, goals, passable):
+        size = self.size
+        parent = self.parent = {}
+        queue = []
+        for src in sources:
+            if src in parent:
+                continue
+            parent[src] = -1
+            if src in goals:
+                return src
+            queue.append(src)
+
+        head = 0
+        while head < len(queue):
+            idx = queue[head]
+            head += 1
+            x, y = divmod(idx, size)
+            for nb, inside in ((idx - size, x > 0), (idx + size, x < size - 1),
+                               (idx - 1, y > 0), (idx + 1, y < size - 1)):
+                if not inside or nb in parent or not passable[nb]:
+                    continue
+                parent[nb] = idx
+                if nb in goals:
+                    self.expanded += head
+                    return nb
+                queue.append(nb)
+        self.expanded += head
+        return -1
+
+# ------------------- FlatSet Class -------------------
+class FlatSet(set):
+    """
+    A set of flat cell indices that can be used wherever a bytearray cell
+    map is expected: s[idx] is 1 for members and 0 otherwise, and setting
+    s[idx] to a true value adds idx.
+    """
+    def __getitem__(self, idx):
+        return 1 if idx in self else 0
+
+    def __setitem__(self, idx, value):
+        if value:
+            self.add(idx)
+        else:
+            self.discard(idx)
+
+# ------------------- PlanCache Class -------------------
+class PlanCache:
+    """
+    Keeps the route from the agent's last search so that it can keep
+    walking it without searching again on every step.
+
+    A route is stored under a key (what it leads to, e.g. "explore" or a
+    vantage point for a given wumpus). It stays valid while the agent asks
+    again with the same key from the next cell on the route, and while no
+    newly safe cell is closer (Manhattan distance) than the rest of the
+    route. Cells that far away cannot give a shorter route, so the plan is
+    kept; otherwise it is dropped and the caller searches again. Safe cells
+    never become unsafe again, so the route itself stays walkable.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        self.key = None
+        self.route = []
+        self.pos = 0
+
+    def store(self, key, route):
+        """Cache `route` (flat indices, starting at the agent) and return its first move."""
+        self.key = key
+        self.route = route
+        self.pos = 1
+        return route[1]
+
+    def next_step(self, key, current, new_safe):
+        """
+        Return the next cell on the cached route, or -1 if the plan is
+        missing or stale. `new_safe` lists the cells that became safe since
+        the previous call.
+        """
+        route = self.route
+        if self.key != key or self.pos >= len(route) - 1 or route[self.pos] != current:
+            self.clear()
+            return -1
+        remaining = len(route) - 1 - self.pos
+        cx, cy = divmod(current, self.size)
+        for idx in new_safe:
+            x, y = divmod(idx, self.size)
+            if abs(x - cx) + abs(y - cy) < remaining:
+                self.clear()
+                return -1
+        self.pos += 1
+        return route[self.pos]
@@ -0,0 +1,7 @@
+# tests/conftest.py
+import os
+import sys
+
+# The modules live at the top of the repository; make them importable
+# however pytest is started.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
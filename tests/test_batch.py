@@ -0,0 +1,21 @@
+# tests/test_batch.py
+from batch import SEED_LIMIT, episode_seed, run_batch
+from episode_log import read_episodes
+
+def test_largest_seeds_fit_the_log(tmp_path):
+    log = str(tmp_path / "run.wlog")
+    run_batch(2, workers=1, base_seed=SEED_LIMIT - 1, log=log)
+    seeds = [episode.seed for episode in read_episodes(log)]
+    assert seeds == [episode_seed(SEED_LIMIT - 1, i) for i in range(2)]
+    assert max(seeds) < 1 << 64
+
+def test_out_of_range_base_seed_is_rejected(tmp_path):
+    for base_seed in (-1, SEED_LIMIT):
+        log = tmp_path / f"{base_seed}.wlog"
+        try:
+            run_batch(1, workers=1, base_seed=base_seed, log=str(log))
+        except Exception as exc:
+            assert "out of range" in str(exc)
+        else:
+            raise AssertionError(f"run_batch accepted base seed {base_seed}")
+        assert not log.exists()
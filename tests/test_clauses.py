@@ -0,0 +1,46 @@
+# tests/test_clauses.py
+from engine import WumpusEngine
+from knowledge import ClauseKnowledge
+
+def check_sound(knowledge, world):
+    # Every deduction must hold on the real board (live wumpuses only).
+    for cell in knowledge.known_wumpuses():
+        assert world.wumpuses[cell], f"{cell} named as a wumpus"
+    for cell in knowledge.safe_set:
+        assert not world.pits[cell] and not world.wumpuses[cell], f"{cell} marked safe"
+    for x in range(world.size):
+        for y in range(world.size):
+            for hazard, plane in (('pit', world.pits), ('wumpus', world.wumpuses)):
+                value = knowledge.value((x, y), hazard)
+                assert value == 0.5 or value == plane[x, y], f"{hazard} at {(x, y)} is {value}"
+
+def play_checked(seeds, **engine_args):
+    """Play seeded episodes with the clause backend, checking it after every update. Returns the kills seen."""
+    engine = WumpusEngine(knowledge="clauses", **engine_args)
+    kills = 0
+    for seed in seeds:
+        engine.new_game(seed=seed)
+        while not engine.game.game_over:
+            engine.update_knowledge()
+            check_sound(engine.knowledge, engine.game.world)
+            left = engine.game.world.count_wumpuses()
+            engine.step()
+            kills += left - engine.game.world.count_wumpuses()
+        if engine.game.agent.alive:
+            # (A fatal cell is still recorded as visited, so skip it after a death.)
+            engine.update_knowledge()
+            check_sound(engine.knowledge, engine.game.world)
+    return kills
+
+def test_clauses_sound_on_default_boards():
+    assert play_checked(range(15)) > 0
+
+def test_clauses_sound_on_crowded_boards():
+    # Many kills next to other wumpuses, so stench clauses are retracted
+    # and deductions undone while neighbours still smell.
+    assert play_checked(range(40), size=10, num_wumpuses=10, num_pits=4) > 0
+
+def test_clauses_allocate_nothing_per_cell():
+    knowledge = ClauseKnowledge(1000)
+    assert len(knowledge.values) < 20
+    assert sum(len(w) for w in knowledge.watches.values()) == 0
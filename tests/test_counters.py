@@ -0,0 +1,42 @@
+# tests/test_counters.py
+from logic import WumpusWorld
+from engine import WumpusEngine
+
+def play_checked(monkeypatch, seeds, **engine_args):
+    """
+    Play seeded episodes with WumpusWorld.check_counters on, so every
+    count_wumpuses/count_pits call checks the live counters against a full
+    scan, and validate after every action too. Returns the kills seen.
+    """
+    monkeypatch.setattr(WumpusWorld, "check_counters", True)
+    engine = WumpusEngine(**engine_args)
+    kills = 0
+    for seed in seeds:
+        engine.new_game(seed=seed)
+        world = engine.game.world
+        start = len(world.wumpus_positions)
+        while not engine.game.game_over:
+            engine.step()
+            world.validate_counters()
+        kills += start - len(world.wumpus_positions)
+    return kills
+
+def test_counters_stay_in_sync_through_kills(monkeypatch):
+    kills = play_checked(monkeypatch, range(20))
+    assert kills > 0
+
+def test_counters_on_density_boards(monkeypatch):
+    kills = play_checked(monkeypatch, range(10), size=12, pit_prob=0.1,
+                         num_wumpuses=None, num_pits=None)
+    assert kills > 0
+
+def test_validate_counters_catches_a_desync():
+    world = WumpusWorld(seed=0)
+    world.validate_counters()
+    world.pit_count += 1
+    try:
+        world.validate_counters()
+    except Exception as exc:
+        assert "Pit counter" in str(exc)
+    else:
+        raise AssertionError("validate_counters missed a wrong pit counter")
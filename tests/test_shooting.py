@@ -0,0 +1,32 @@
+# tests/test_shooting.py
+from engine import WumpusEngine
+from knowledge import BACKENDS
+
+# Boards where every visited neighbour of a killed wumpus still smells
+# another one, so the percepts alone never clear the dead cell.
+CROWDED = dict(size=10, num_wumpuses=10, num_pits=4)
+SEEDS = (14, 358, 396)
+
+def test_no_shot_at_a_dead_wumpus():
+    for name in sorted(BACKENDS):
+        engine = WumpusEngine(knowledge=name, **CROWDED)
+        for seed in SEEDS:
+            engine.new_game(seed=seed)
+            while not engine.game.game_over:
+                left = engine.game.world.count_wumpuses()
+                if engine.step() == "shoot":
+                    assert engine.game.world.count_wumpuses() == left - 1, \
+                        f"{name} missed a shot on seed {seed}"
+                    assert engine.game.agent.alive
+
+def test_kill_clears_a_known_wumpus():
+    for name in sorted(BACKENDS):
+        engine = WumpusEngine(knowledge=name, **CROWDED)
+        engine.new_game(seed=14)
+        while not engine.knowledge.known_wumpuses():
+            engine.step()
+        cell = engine.knowledge.known_wumpuses()[0]
+        engine.knowledge.kill(cell)
+        engine.update_knowledge()
+        assert engine.knowledge.value(cell, 'wumpus') == 0, name
+        assert cell not in engine.knowledge.known_wumpuses(), name